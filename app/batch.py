@@ -0,0 +1,151 @@
+import glob
+import io
+import json
+import os
+import signal
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from time import perf_counter
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+
+from app.cache import DEFAULT_MAX_BYTES, AstCache
+from app.limits import Limits
+from app.lox import LoxSession
+
+# NB: same convention as coreutils timeout(1)
+TIMEOUT_EXIT_CODE = 124
+
+
+class ScriptTimeout(Exception):
+    pass
+
+
+def collect_scripts(target: str) -> List[str]:
+    if os.path.isdir(target):
+        pattern = os.path.join(target, "**", "*.lox")
+        return sorted(glob.glob(pattern, recursive=True))
+
+    if os.path.isfile(target) and target.endswith(".lox"):
+        return [target]
+
+    if os.path.isfile(target):
+        # NB: a manifest lists one script per line, relative to the manifest
+        base = os.path.dirname(target)
+        with open(target) as manifest:
+            lines = [line.strip() for line in manifest]
+        return [
+            os.path.join(base, line)
+            for line in lines
+            if line and not line.startswith("#")
+        ]
+
+    return sorted(glob.glob(target, recursive=True))
+
+
+def _on_alarm(signum, frame) -> None:
+    raise ScriptTimeout()
+
+
+_CACHES: Dict[Tuple[str, int], AstCache] = dict()
+
+
+# NB: one cache per worker process rather than per script, so its running size
+# estimate carries over and the directory is not rescanned for every store
+def worker_cache(directory: str, max_bytes: int) -> AstCache:
+    key = (directory, max_bytes)
+    if key not in _CACHES:
+        _CACHES[key] = AstCache(directory, max_bytes)
+
+    return _CACHES[key]
+
+
+def run_script(
+    path: str,
+    engine: str = "tree",
+    opt_level: int = 0,
+    timeout: Optional[float] = None,
+    cache_dir: Optional[str] = None,
+    limits: Optional[Limits] = None,
+    cache_max_bytes: int = DEFAULT_MAX_BYTES,
+) -> dict:
+    stdout, stderr = io.StringIO(), io.StringIO()
+    cache = None
+    if cache_dir is not None:
+        cache = worker_cache(cache_dir, cache_max_bytes)
+        hits = cache.hits
+    # NB: a fresh session per script, so nothing leaks between tasks that
+    # happen to share a worker process
+    session = LoxSession(
+        engine, opt_level, stdout, stderr, flush="end", cache=cache, limits=limits
+    )
+    timed_out = False
+
+    if timeout:
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+
+    start = perf_counter()
+    try:
+        exit_code = session.run_file(path).exit_code
+    except ScriptTimeout:
+        session.interpreter.output.flush()
+        print(f"Timed out after {timeout}s.", file=stderr)
+        exit_code, timed_out = TIMEOUT_EXIT_CODE, True
+    except Exception:
+        stderr.write(traceback.format_exc())
+        exit_code = 1
+    finally:
+        if timeout:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    elapsed = perf_counter() - start
+
+    result = {
+        "path": path,
+        "exit_code": exit_code,
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+        "timed_out": timed_out,
+        "elapsed": round(elapsed, 6),
+    }
+    if cache is not None:
+        result["cache_hit"] = cache.hits > hits
+
+    return result
+
+
+def run_batch(
+    paths: List[str],
+    jobs: Optional[int] = None,
+    timeout: Optional[float] = None,
+    engine: str = "tree",
+    opt_level: int = 0,
+    cache_dir: Optional[str] = None,
+    limits: Optional[Limits] = None,
+    cache_max_bytes: int = DEFAULT_MAX_BYTES,
+) -> Iterator[dict]:
+    task = partial(
+        run_script,
+        engine=engine,
+        opt_level=opt_level,
+        timeout=timeout,
+        cache_dir=cache_dir,
+        limits=limits,
+        cache_max_bytes=cache_max_bytes,
+    )
+    workers = jobs or os.cpu_count() or 1
+    # NB: hand out work in small batches to amortize the round trips without
+    # letting one worker hoard a long tail of slow scripts
+    chunksize = max(1, min(16, len(paths) // (workers * 4)))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(task, paths, chunksize=chunksize)
+
+
+def write_results(results: Iterator[dict], out: TextIO) -> int:
+    failed = 0
+    for result in results:
+        out.write(json.dumps(result) + "\n")
+        failed += result["exit_code"] != 0
+
+    return failed
@@ -0,0 +1,100 @@
+from enum import IntEnum, auto
+from typing import Dict, List
+
+from app.scanner import ValidToken
+
+
+class OpCode(IntEnum):
+    CONSTANT = auto()
+    NIL = auto()
+    TRUE = auto()
+    FALSE = auto()
+    POP = auto()
+    POP_N = auto()
+    GET_LOCAL = auto()
+    SET_LOCAL = auto()
+    GET_GLOBAL = auto()
+    SET_GLOBAL = auto()
+    DEFINE_GLOBAL = auto()
+    UNDEFINED = auto()
+    EQUAL = auto()
+    NOT_EQUAL = auto()
+    GREATER = auto()
+    GREATER_EQUAL = auto()
+    LESS = auto()
+    LESS_EQUAL = auto()
+    ADD = auto()
+    SUBTRACT = auto()
+    MULTIPLY = auto()
+    DIVIDE = auto()
+    NOT = auto()
+    NEGATE = auto()
+    PRINT = auto()
+    JUMP = auto()
+    POP_JUMP_IF_FALSE = auto()
+    JUMP_IF_FALSE_OR_POP = auto()
+    JUMP_IF_TRUE_OR_POP = auto()
+    RETURN = auto()
+
+
+# NB: number of inline operands following each opcode
+OPERANDS = {
+    OpCode.CONSTANT: 1,
+    OpCode.POP_N: 1,
+    OpCode.GET_LOCAL: 1,
+    OpCode.SET_LOCAL: 1,
+    OpCode.GET_GLOBAL: 1,
+    OpCode.SET_GLOBAL: 1,
+    OpCode.DEFINE_GLOBAL: 1,
+    OpCode.JUMP: 1,
+    OpCode.POP_JUMP_IF_FALSE: 1,
+    OpCode.JUMP_IF_FALSE_OR_POP: 1,
+    OpCode.JUMP_IF_TRUE_OR_POP: 1,
+}
+
+
+class Chunk:
+    def __init__(self):
+        self.code: List[int] = []
+        self.lines: List[int] = []
+        self.constants: List[object] = []
+        # NB: offset of every instruction that can fail -> the token it reports
+        self.tokens: Dict[int, ValidToken] = dict()
+
+    def write(self, byte: int, line: int) -> int:
+        self.code.append(byte)
+        self.lines.append(line)
+        return len(self.code) - 1
+
+    def add_constant(self, value: object) -> int:
+        self.constants.append(value)
+        return len(self.constants) - 1
+
+
+def disassemble(chunk: Chunk, name: str) -> str:
+    lines = [f"== {name} =="]
+    offset = 0
+    while offset < len(chunk.code):
+        op = OpCode(chunk.code[offset])
+        line = (
+            "   |"
+            if offset > 0 and chunk.lines[offset] == chunk.lines[offset - 1]
+            else f"{chunk.lines[offset]:>4}"
+        )
+        text = f"{offset:04} {line} {op.name:<20}"
+
+        if OPERANDS.get(op):
+            operand = chunk.code[offset + 1]
+            text += f" {operand:>4}"
+            if op is OpCode.CONSTANT:
+                text += f" '{chunk.constants[operand]}'"
+            elif op in (OpCode.GET_GLOBAL, OpCode.SET_GLOBAL, OpCode.DEFINE_GLOBAL):
+                if offset in chunk.tokens:
+                    text += f" '{chunk.tokens[offset].lexeme}'"
+        elif op is OpCode.UNDEFINED:
+            text += f"      '{chunk.tokens[offset].lexeme}'"
+
+        lines.append(text.rstrip())
+        offset += 1 + OPERANDS.get(op, 0)
+
+    return "\n".join(lines)
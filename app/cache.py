@@ -0,0 +1,127 @@
+import os
+import pickle
+import tempfile
+from hashlib import sha256
+from typing import List, Optional
+
+from app.stmt import Stmt
+
+# NB: bump whenever the scanner, parser or AST node layout changes so stale
+# entries are never mistaken for current ones
+CACHE_VERSION = "lox-ast-5"
+SUFFIX = ".ast"
+DEFAULT_MAX_BYTES = 64 << 20
+# NB: other processes may be filling the same directory, so the running size
+# estimate is corrected by a fresh scan at least this often
+RESCAN_INTERVAL = 64
+
+
+class AstCache:
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        # NB: bytes on disk as of the last scan plus what was stored since;
+        # None until the first scan
+        self._size: Optional[int] = None
+        self._unscanned = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, source: str) -> str:
+        digest = sha256(CACHE_VERSION.encode())
+        digest.update(b"\0")
+        digest.update(source.encode("utf-8", "surrogatepass"))
+        return os.path.join(self.directory, digest.hexdigest() + SUFFIX)
+
+    def load(self, source: str) -> Optional[List[Stmt]]:
+        path = self.path(source)
+        try:
+            with open(path, "rb") as file:
+                statements = pickle.load(file)
+            # NB: the modification time doubles as the LRU timestamp
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception:
+            # NB: a truncated or foreign entry is a miss, never an error
+            self.discard(path)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return statements
+
+    def store(self, source: str, statements: List[Stmt]) -> None:
+        try:
+            data = pickle.dumps(statements, pickle.HIGHEST_PROTOCOL)
+        except RecursionError:
+            return
+
+        # NB: write to a private file and rename it into place, so concurrent
+        # readers only ever see complete entries
+        fd, temp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(temp, self.path(source))
+        except OSError:
+            self.discard(temp)
+            return
+
+        self.stores += 1
+        self.grow(len(data))
+
+    # NB: scanning the directory on every store made filling a cache quadratic
+    # in its number of entries
+    def grow(self, size: int) -> None:
+        self._unscanned += 1
+        if self._size is not None:
+            self._size += size
+        if (
+            self._size is None
+            or self._size > self.max_bytes
+            or self._unscanned >= RESCAN_INTERVAL
+        ):
+            self.evict()
+
+    def evict(self) -> None:
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if not entry.name.endswith(SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self.discard(path)
+            self.evictions += 1
+            total -= size
+
+        self._size = total
+        self._unscanned = 0
+
+    def discard(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            # NB: another process may have evicted it first
+            pass
+
+    def stats(self) -> str:
+        lookups = self.hits + self.misses
+        rate = self.hits / lookups if lookups else 0.0
+        return (
+            f"ast cache: {self.hits} hits, {self.misses} misses ({rate:.0%}), "
+            f"{self.stores} stores, {self.evictions} evictions"
+        )
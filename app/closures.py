@@ -0,0 +1,380 @@
+from typing import Callable, List, Optional
+
+from app import lox
+from app.environment import UNDEFINED, Environment
+from app.error import RuntimeError_
+from app.expr import (
+    Assign,
+    Binary,
+    Expr,
+    ExprVisitor,
+    Grouping,
+    Literal,
+    Logical,
+    Unary,
+    Variable,
+)
+from app.interpreter import Interpreter
+from app.loops import COMPARISONS
+from app.output import Output
+from app.scanner import ValidTokenType
+from app.stmt import Block, Expression, If, Print, Stmt, StmtVisitor, Var, While
+from app.strings import NUMBERS, STRINGS, concat
+
+Code = Callable[[Environment], object]
+
+
+class ClosureCompiler(ExprVisitor, StmtVisitor):
+    def __init__(self, interpreter: Interpreter):
+        self._interpreter = interpreter
+
+    def compile(self, statements: List[Stmt]) -> Code:
+        codes = tuple(self.compile_stmt(statement) for statement in statements)
+
+        def program(env):
+            for code in codes:
+                code(env)
+
+        return program
+
+    def compile_stmt(self, stmt: Stmt) -> Code:
+        return stmt.accept(self)
+
+    def compile_expr(self, expr: Expr) -> Code:
+        return expr.accept(self)
+
+    def is_boolean(self, expr: Expr) -> bool:
+        if isinstance(expr, Grouping):
+            return self.is_boolean(expr.expression)
+        if isinstance(expr, Binary):
+            return expr.op in COMPARISONS or expr.op in (
+                ValidTokenType.EQUAL_EQUAL,
+                ValidTokenType.BANG_EQUAL,
+            )
+        if isinstance(expr, Unary):
+            return expr.op == ValidTokenType.BANG
+        return False
+
+    def compile_condition(self, expr: Expr) -> Code:
+        code = self.compile_expr(expr)
+        if self.is_boolean(expr):
+            return code
+
+        is_truthy = self._interpreter.is_truthy
+        return lambda env: is_truthy(code(env))
+
+    def visit_expression_stmt(self, stmt: Expression) -> Code:
+        return self.compile_expr(stmt.expression)
+
+    def visit_if_stmt(self, stmt: If) -> Code:
+        condition = self.compile_condition(stmt.condition)
+        then_branch = self.compile_stmt(stmt.then_branch)
+
+        if stmt.else_branch is None:
+
+            def if_(env):
+                if condition(env):
+                    then_branch(env)
+
+            return if_
+
+        else_branch = self.compile_stmt(stmt.else_branch)
+
+        def if_else(env):
+            if condition(env):
+                then_branch(env)
+            else:
+                else_branch(env)
+
+        return if_else
+
+    def visit_print_stmt(self, stmt: Print) -> Code:
+        expression = self.compile_expr(stmt.expression)
+        stringify = self._interpreter.stringify
+        write_line = self._interpreter.output.write_line
+
+        def print_(env):
+            write_line(stringify(expression(env)))
+
+        return print_
+
+    def visit_block_stmt(self, stmt: Block) -> Code:
+        codes = tuple(self.compile_stmt(statement) for statement in stmt.statements)
+        size = stmt.size
+
+        if size == 0:
+            if len(codes) == 1:
+                return codes[0]
+
+            def sequence(env):
+                for code in codes:
+                    code(env)
+
+            return sequence
+        if stmt.loop is not None and self._interpreter.fuse_loops:
+            return self.compile_counted_loop(stmt)
+
+        def block(env):
+            inner = Environment(env, size)
+            for code in codes:
+                code(inner)
+
+        return block
+
+    def compile_counted_loop(self, stmt: Block) -> Code:
+        loop = stmt.loop
+        size, slot = stmt.size, loop.declaration.slot
+        declare = self.compile_stmt(loop.declaration)
+        fallback = self.compile_stmt(loop.loop)
+        body = self.compile_stmt(loop.body)
+        limit = self.compile_expr(loop.limit)
+        compare, step, op = loop.compare, loop.step, loop.operator
+        check = self._interpreter.check_number_operands
+
+        def counted(env):
+            inner = Environment(env, size)
+            declare(inner)
+            values = inner.values
+            counter = values[slot]
+            if type(counter) not in NUMBERS:
+                fallback(inner)
+                return
+
+            while True:
+                bound = limit(inner)
+                if type(bound) not in NUMBERS:
+                    check(op, counter, bound)
+                if not compare(counter, bound):
+                    return
+                body(inner)
+                counter += step
+                values[slot] = counter
+
+        return counted
+
+    def visit_while_stmt(self, stmt: While) -> Code:
+        body = self.compile_stmt(stmt.body)
+
+        # NB: covers the condition Parser.for_statement synthesizes for "for (;;)"
+        if isinstance(stmt.condition, Literal) and self._interpreter.is_truthy(
+            stmt.condition.constant
+        ):
+
+            def forever(env):
+                while True:
+                    body(env)
+
+            return forever
+
+        condition = self.compile_condition(stmt.condition)
+
+        def while_(env):
+            while condition(env):
+                body(env)
+
+        return while_
+
+    def visit_var_stmt(self, stmt: Var) -> Code:
+        slot = stmt.slot
+        if stmt.initializer is None:
+            return lambda env: env.define(slot, None)
+
+        initializer = self.compile_expr(stmt.initializer)
+
+        def var(env):
+            value = initializer(env)
+            try:
+                env.values[slot] = value
+            except IndexError:
+                env.define(slot, value)
+
+        return var
+
+    def visit_assign_expr(self, expr: Assign) -> Code:
+        value_code = self.compile_expr(expr.value)
+        name, depth, slot = expr.name, expr.depth, expr.slot
+
+        if depth == 0:
+
+            def assign_local(env):
+                value = value_code(env)
+                values = env.values
+                if slot < len(values) and values[slot] is not UNDEFINED:
+                    values[slot] = value
+                else:
+                    env.assign_at(depth, slot, name, value)
+                return value
+
+            return assign_local
+
+        def assign(env):
+            value = value_code(env)
+            env.assign_at(depth, slot, name, value)
+            return value
+
+        return assign
+
+    def visit_literal_expr(self, expr: Literal) -> Code:
+        value = expr.constant
+        return lambda env: value
+
+    def visit_logical_expr(self, expr: Logical) -> Code:
+        left = self.compile_expr(expr.left)
+        right = self.compile_expr(expr.right)
+        is_truthy = self._interpreter.is_truthy
+
+        if expr.op == ValidTokenType.OR:
+
+            def or_(env):
+                value = left(env)
+                return value if is_truthy(value) else right(env)
+
+            return or_
+
+        def and_(env):
+            value = left(env)
+            return right(env) if is_truthy(value) else value
+
+        return and_
+
+    def visit_grouping_expr(self, expr: Grouping) -> Code:
+        return self.compile_expr(expr.expression)
+
+    def visit_unary_expr(self, expr: Unary) -> Code:
+        right = self.compile_expr(expr.right)
+        op = expr.operator
+
+        match op.type:
+            case ValidTokenType.MINUS:
+                check = self._interpreter.check_number_operand
+
+                def negate(env):
+                    value = right(env)
+                    if type(value) not in NUMBERS:
+                        check(op, value)
+                    return -value
+
+                return negate
+            case ValidTokenType.BANG:
+                is_truthy = self._interpreter.is_truthy
+                return lambda env: not is_truthy(right(env))
+
+    def visit_variable_expr(self, expr: Variable) -> Code:
+        name, depth, slot = expr.name, expr.depth, expr.slot
+
+        if depth == 0:
+
+            def local(env):
+                try:
+                    value = env.values[slot]
+                except IndexError:
+                    value = UNDEFINED
+                if value is UNDEFINED:
+                    env.get_at(depth, slot, name)
+                return value
+
+            return local
+
+        if depth == 1:
+
+            def enclosing(env):
+                try:
+                    value = env.enclosing.values[slot]
+                except IndexError:
+                    value = UNDEFINED
+                if value is UNDEFINED:
+                    env.get_at(depth, slot, name)
+                return value
+
+            return enclosing
+
+        return lambda env: env.get_at(depth, slot, name)
+
+    def visit_binary_expr(self, expr: Binary) -> Code:
+        left = self.compile_expr(expr.left)
+        right = self.compile_expr(expr.right)
+        op = expr.operator
+        check = self._interpreter.check_number_operands
+
+        match op.type:
+            case ValidTokenType.EQUAL_EQUAL:
+                is_equal = self._interpreter.is_equal
+                return lambda env: is_equal(left(env), right(env))
+            case ValidTokenType.BANG_EQUAL:
+                is_equal = self._interpreter.is_equal
+                return lambda env: not is_equal(left(env), right(env))
+            case ValidTokenType.PLUS:
+
+                def add(env):
+                    a, b = left(env), right(env)
+                    if type(a) in NUMBERS and type(b) in NUMBERS:
+                        return a + b
+                    if type(a) in STRINGS and type(b) in STRINGS:
+                        return concat(a, b)
+                    check(op, a, b)
+
+                return add
+            case ValidTokenType.MINUS:
+
+                def subtract(env):
+                    a, b = left(env), right(env)
+                    if type(a) not in NUMBERS or type(b) not in NUMBERS:
+                        check(op, a, b)
+                    return a - b
+
+                return subtract
+            case ValidTokenType.STAR:
+
+                def multiply(env):
+                    a, b = left(env), right(env)
+                    if type(a) not in NUMBERS or type(b) not in NUMBERS:
+                        check(op, a, b)
+                    return a * b
+
+                return multiply
+            case ValidTokenType.SLASH:
+
+                def divide(env):
+                    a, b = left(env), right(env)
+                    if type(a) not in NUMBERS or type(b) not in NUMBERS:
+                        check(op, a, b)
+                    return a / b
+
+                return divide
+
+        compare = COMPARISONS[op.type]
+
+        def comparison(env):
+            a, b = left(env), right(env)
+            if type(a) not in NUMBERS or type(b) not in NUMBERS:
+                check(op, a, b)
+            return compare(a, b)
+
+        return comparison
+
+
+class ClosureInterpreter(Interpreter):
+    def __init__(
+        self,
+        output: Optional[Output] = None,
+        reporter: Optional["lox.LoxSession"] = None,
+    ):
+        super().__init__(output, reporter)
+        self._compiler = ClosureCompiler(self)
+
+    def interpret_expr(self, expr: Expr) -> None:
+        try:
+            value = self._compiler.compile_expr(expr)(self._environment)
+            self.output.write_line(self.stringify(value))
+        except RuntimeError_ as error:
+            self.runtime_error(error)
+        finally:
+            self.output.flush()
+
+    def interpret(self, statements: List[Stmt]) -> None:
+        try:
+            self._compiler.compile(statements)(self._environment)
+        except RuntimeError_ as error:
+            self.runtime_error(error)
+        finally:
+            self.output.flush()
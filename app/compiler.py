@@ -0,0 +1,197 @@
+from typing import List, Optional
+
+from app.bytecode import Chunk, OpCode
+from app.expr import (
+    Assign,
+    Binary,
+    Expr,
+    ExprVisitor,
+    Grouping,
+    Literal,
+    Logical,
+    Unary,
+    Variable,
+)
+from app.interpreter import Interpreter
+from app.scanner import ValidToken, ValidTokenType
+from app.stmt import Block, Expression, If, Print, Stmt, StmtVisitor, Var, While
+
+_BINARY = {
+    ValidTokenType.EQUAL_EQUAL: OpCode.EQUAL,
+    ValidTokenType.BANG_EQUAL: OpCode.NOT_EQUAL,
+    ValidTokenType.GREATER: OpCode.GREATER,
+    ValidTokenType.GREATER_EQUAL: OpCode.GREATER_EQUAL,
+    ValidTokenType.LESS: OpCode.LESS,
+    ValidTokenType.LESS_EQUAL: OpCode.LESS_EQUAL,
+    ValidTokenType.PLUS: OpCode.ADD,
+    ValidTokenType.MINUS: OpCode.SUBTRACT,
+    ValidTokenType.STAR: OpCode.MULTIPLY,
+    ValidTokenType.SLASH: OpCode.DIVIDE,
+}
+
+
+class Compiler(ExprVisitor, StmtVisitor):
+    def __init__(self, interpreter: Interpreter):
+        self._interpreter = interpreter
+        self._chunk = Chunk()
+        self._line = 1
+        # NB: stack offset of the first local of every enclosing block and the
+        # number of locals currently on the stack
+        self._scopes: List[int] = []
+        self._locals = 0
+
+    def compile(self, statements: List[Stmt]) -> Chunk:
+        for statement in statements:
+            statement.accept(self)
+        self.emit(OpCode.RETURN)
+
+        return self._chunk
+
+    def compile_expr(self, expr: Expr) -> Chunk:
+        expr.accept(self)
+        self.emit(OpCode.RETURN)
+
+        return self._chunk
+
+    def emit(self, *bytes_: int, token: Optional[ValidToken] = None) -> int:
+        if token is not None:
+            self._line = token.line
+            self._chunk.tokens[len(self._chunk.code)] = token
+
+        offset = len(self._chunk.code)
+        for byte in bytes_:
+            self._chunk.write(byte, self._line)
+
+        return offset
+
+    def emit_jump(self, op: OpCode) -> int:
+        return self.emit(op, -1) + 1
+
+    def patch_jump(self, operand: int) -> None:
+        self._chunk.code[operand] = len(self._chunk.code)
+
+    def local(self, depth: int, slot: int) -> int:
+        return self._scopes[len(self._scopes) - 1 - depth] + slot
+
+    def is_global(self, depth: int) -> bool:
+        return depth == len(self._scopes)
+
+    def visit_expression_stmt(self, stmt: Expression) -> None:
+        stmt.expression.accept(self)
+        self.emit(OpCode.POP)
+
+    def visit_print_stmt(self, stmt: Print) -> None:
+        stmt.expression.accept(self)
+        self.emit(OpCode.PRINT)
+
+    def visit_var_stmt(self, stmt: Var) -> None:
+        if stmt.initializer is not None:
+            stmt.initializer.accept(self)
+        else:
+            self.emit(OpCode.NIL)
+
+        if not self._scopes:
+            self.emit(OpCode.DEFINE_GLOBAL, stmt.slot, token=stmt.name)
+        elif stmt.slot == self._locals - self._scopes[-1]:
+            # NB: a fresh local simply stays where it was pushed
+            self._locals += 1
+        else:
+            self.emit(OpCode.SET_LOCAL, self._scopes[-1] + stmt.slot)
+            self.emit(OpCode.POP)
+
+    def visit_block_stmt(self, stmt: Block) -> None:
+        if stmt.size == 0:
+            for statement in stmt.statements:
+                statement.accept(self)
+            return
+
+        self._scopes.append(self._locals)
+        try:
+            for statement in stmt.statements:
+                statement.accept(self)
+        finally:
+            base = self._scopes.pop()
+
+        if self._locals > base:
+            self.emit(OpCode.POP_N, self._locals - base)
+        self._locals = base
+
+    def visit_if_stmt(self, stmt: If) -> None:
+        stmt.condition.accept(self)
+        else_jump = self.emit_jump(OpCode.POP_JUMP_IF_FALSE)
+        stmt.then_branch.accept(self)
+
+        if stmt.else_branch is None:
+            self.patch_jump(else_jump)
+            return
+
+        end_jump = self.emit_jump(OpCode.JUMP)
+        self.patch_jump(else_jump)
+        stmt.else_branch.accept(self)
+        self.patch_jump(end_jump)
+
+    def visit_while_stmt(self, stmt: While) -> None:
+        start = len(self._chunk.code)
+        stmt.condition.accept(self)
+        exit_jump = self.emit_jump(OpCode.POP_JUMP_IF_FALSE)
+        stmt.body.accept(self)
+        self.emit(OpCode.JUMP, start)
+        self.patch_jump(exit_jump)
+
+    def visit_assign_expr(self, expr: Assign) -> None:
+        expr.value.accept(self)
+        self._line = expr.name.line
+
+        if expr.depth is None:
+            self.emit(OpCode.UNDEFINED, token=expr.name)
+        elif self.is_global(expr.depth):
+            self.emit(OpCode.SET_GLOBAL, expr.slot, token=expr.name)
+        else:
+            self.emit(OpCode.SET_LOCAL, self.local(expr.depth, expr.slot))
+
+    def visit_variable_expr(self, expr: Variable) -> None:
+        self._line = expr.name.line
+        if expr.depth is None:
+            self.emit(OpCode.UNDEFINED, token=expr.name)
+        elif self.is_global(expr.depth):
+            self.emit(OpCode.GET_GLOBAL, expr.slot, token=expr.name)
+        else:
+            self.emit(OpCode.GET_LOCAL, self.local(expr.depth, expr.slot))
+
+    def visit_literal_expr(self, expr: Literal) -> None:
+        self._line = expr.value.line
+        match expr.value.type:
+            case ValidTokenType.NIL:
+                self.emit(OpCode.NIL)
+            case ValidTokenType.TRUE:
+                self.emit(OpCode.TRUE)
+            case ValidTokenType.FALSE:
+                self.emit(OpCode.FALSE)
+            case _:
+                value = expr.constant
+                self.emit(OpCode.CONSTANT, self._chunk.add_constant(value))
+
+    def visit_grouping_expr(self, expr: Grouping) -> None:
+        expr.expression.accept(self)
+
+    def visit_logical_expr(self, expr: Logical) -> None:
+        expr.left.accept(self)
+        if expr.op == ValidTokenType.OR:
+            end_jump = self.emit_jump(OpCode.JUMP_IF_TRUE_OR_POP)
+        else:
+            end_jump = self.emit_jump(OpCode.JUMP_IF_FALSE_OR_POP)
+        expr.right.accept(self)
+        self.patch_jump(end_jump)
+
+    def visit_unary_expr(self, expr: Unary) -> None:
+        expr.right.accept(self)
+        match expr.op:
+            case ValidTokenType.MINUS:
+                self.emit(OpCode.NEGATE, token=expr.operator)
+            case ValidTokenType.BANG:
+                self.emit(OpCode.NOT, token=expr.operator)
+
+    def visit_binary_expr(self, expr: Binary) -> None:
+        expr.left.accept(self)
+        expr.right.accept(self)
+        self.emit(_BINARY[expr.op], token=expr.operator)
@@ -2,29 +2,41 @@ from .error import RuntimeError_
 from .scanner import ValidToken
 from typing import Optional
 
+# NB: marks slots whose declaration has not been executed yet
+UNDEFINED = object()
+
 
 class Environment:
-    def __init__(self, enclosing: Optional["Environment"] = None):
+    def __init__(self, enclosing: Optional["Environment"] = None, size: int = 0):
         self.enclosing = enclosing
-        self.values = dict()
-
-    def get(self, name: ValidToken) -> object:
-        if name.lexeme in self.values:
-            return self.values[name.lexeme]
-        elif self.enclosing:
-            return self.enclosing.get(name)
-        else:
-            raise RuntimeError_(name, f"Undefined variable '{name.lexeme}'.")
-
-    def define(self, name: str, value: object) -> None:
-        self.values[name] = value
-
-    def assign(self, name: ValidToken, value: object) -> None:
-        if name.lexeme in self.values:
-            self.values[name.lexeme] = value
-            return
-        elif self.enclosing:
-            self.enclosing.assign(name, value)
-            return
-        else:
-            raise RuntimeError_(name, f"Undefined variable '{name.lexeme}'.")
+        self.values = [UNDEFINED] * size
+
+    def ancestor(self, distance: int) -> "Environment":
+        environment = self
+        for _ in range(distance):
+            environment = environment.enclosing
+        return environment
+
+    def get_at(self, distance: Optional[int], slot: int, name: ValidToken) -> object:
+        if distance is not None:
+            values = self.ancestor(distance).values
+            if slot < len(values) and values[slot] is not UNDEFINED:
+                return values[slot]
+
+        raise RuntimeError_(name, f"Undefined variable '{name.lexeme}'.")
+
+    def define(self, slot: int, value: object) -> None:
+        if slot >= len(self.values):
+            self.values.extend([UNDEFINED] * (slot + 1 - len(self.values)))
+        self.values[slot] = value
+
+    def assign_at(
+        self, distance: Optional[int], slot: int, name: ValidToken, value: object
+    ) -> None:
+        if distance is not None:
+            values = self.ancestor(distance).values
+            if slot < len(values) and values[slot] is not UNDEFINED:
+                values[slot] = value
+                return
+
+        raise RuntimeError_(name, f"Undefined variable '{name.lexeme}'.")
@@ -9,3 +9,34 @@ class RuntimeError_(RuntimeError):
     def __init__(self, token: ValidTokenType, message: str):
         self.token = token
         super().__init__(message)
+
+    @property
+    def line(self) -> int:
+        return self.token.line
+
+
+# NB: resource limits are hit between tokens, so they carry the line instead
+class LimitError(RuntimeError_):
+    def __init__(self, line: int, message: str):
+        super().__init__(None, message)
+        self._line = line
+
+    @property
+    def line(self) -> int:
+        return self._line
+
+
+class StatementLimitError(LimitError):
+    pass
+
+
+class IterationLimitError(LimitError):
+    pass
+
+
+class TimeLimitError(LimitError):
+    pass
+
+
+class StringLimitError(LimitError):
+    pass
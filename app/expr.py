@@ -1,7 +1,7 @@
 import abc
-from typing import Protocol, TypeVar
+from typing import Callable, Optional, Protocol, TypeVar
 
-from .scanner import ValidToken
+from .scanner import ValidToken, ValidTokenType
 
 T = TypeVar("T")
 
@@ -22,31 +22,76 @@ class ExprVisitor(Protocol[T]):
     def visit_variable_expr(self, expr: "Variable") -> T: ...
 
 
+# NB: operators keep only their type and line; the token is rebuilt on demand
+# from this shared table
+_LEXEMES = {
+    ValidTokenType.AND: "and",
+    ValidTokenType.OR: "or",
+    ValidTokenType.BANG: "!",
+    ValidTokenType.BANG_EQUAL: "!=",
+    ValidTokenType.EQUAL_EQUAL: "==",
+    ValidTokenType.GREATER: ">",
+    ValidTokenType.GREATER_EQUAL: ">=",
+    ValidTokenType.LESS: "<",
+    ValidTokenType.LESS_EQUAL: "<=",
+    ValidTokenType.MINUS: "-",
+    ValidTokenType.PLUS: "+",
+    ValidTokenType.SLASH: "/",
+    ValidTokenType.STAR: "*",
+}
+
+
+def _operator(op: ValidTokenType, line: int) -> ValidToken:
+    return ValidToken(op, _LEXEMES[op], None, line)
+
+
 class Expr(abc.ABC):
+    __slots__ = ()
+
     @abc.abstractmethod
     def accept(self, visitor: "ExprVisitor[T]") -> T: ...
 
 
 class Assign(Expr):
+    __slots__ = ("name", "value", "depth", "slot")
+
     def __init__(self, name: ValidToken, value: Expr):
         self.name = name
         self.value = value
+        self.depth: Optional[int] = None
+        self.slot: Optional[int] = None
 
     def accept(self, visitor: ExprVisitor[T]) -> T:
         return visitor.visit_assign_expr(self)
 
 
 class Binary(Expr):
+    __slots__ = ("left", "op", "line", "right", "guard", "streak", "deopts", "fast")
+
     def __init__(self, left: Expr, operator: ValidToken, right: Expr):
         self.left = left
-        self.operator = operator
+        self.op = operator.type
+        self.line = operator.line
         self.right = right
+        # NB: type feedback for the tree-walking interpreter, which records the
+        # operand types it sees here and swaps in a specialized operation once
+        # they settle; see Interpreter.visit_binary_expr
+        self.guard: Optional[tuple] = None
+        self.streak = 0
+        self.deopts = 0
+        self.fast: Optional[Callable[[object, object], object]] = None
+
+    @property
+    def operator(self) -> ValidToken:
+        return _operator(self.op, self.line)
 
     def accept(self, visitor: ExprVisitor[T]) -> T:
         return visitor.visit_binary_expr(self)
 
 
 class Grouping(Expr):
+    __slots__ = ("expression",)
+
     def __init__(self, expression: Expr):
         self.expression = expression
 
@@ -54,15 +99,38 @@ class Grouping(Expr):
         return visitor.visit_grouping_expr(self)
 
 
+def _decode(token: ValidToken) -> object:
+    if token.type is ValidTokenType.INTEGER:
+        return int(float(token.literal))
+    elif token.type is ValidTokenType.FLOAT:
+        return float(token.literal)
+    elif token.type is ValidTokenType.TRUE:
+        return True
+    elif token.type is ValidTokenType.FALSE:
+        return False
+    elif token.type is ValidTokenType.NIL:
+        return None
+    if token.literal is not None:
+        return token.literal
+    else:
+        return token.lexeme
+
+
 class Literal(Expr):
+    __slots__ = ("value", "constant")
+
     def __init__(self, value: ValidToken):
         self.value = value
+        # NB: decoded once here so evaluation never re-parses the token text
+        self.constant = _decode(value)
 
     def accept(self, visitor: ExprVisitor[T]) -> T:
         return visitor.visit_literal_expr(self)
 
 
 class Logical(Expr):
+    __slots__ = ("left", "op", "line", "right")
+
     def __init__(
         self,
         left: Expr,
@@ -70,25 +138,41 @@ class Logical(Expr):
         right: Expr,
     ):
         self.left = left
-        self.operator = operator
+        self.op = operator.type
+        self.line = operator.line
         self.right = right
 
+    @property
+    def operator(self) -> ValidToken:
+        return _operator(self.op, self.line)
+
     def accept(self, visitor: ExprVisitor[T]) -> T:
         return visitor.visit_logical_expr(self)
 
 
 class Unary(Expr):
+    __slots__ = ("op", "line", "right")
+
     def __init__(self, operator: ValidToken, right: Expr):
-        self.operator = operator
+        self.op = operator.type
+        self.line = operator.line
         self.right = right
 
+    @property
+    def operator(self) -> ValidToken:
+        return _operator(self.op, self.line)
+
     def accept(self, visitor: ExprVisitor[T]) -> T:
         return visitor.visit_unary_expr(self)
 
 
 class Variable(Expr):
+    __slots__ = ("name", "depth", "slot")
+
     def __init__(self, name: ValidToken):
         self.name = name
+        self.depth: Optional[int] = None
+        self.slot: Optional[int] = None
 
     def accept(self, visitor: ExprVisitor[T]) -> T:
         return visitor.visit_variable_expr(self)
@@ -1,4 +1,5 @@
-from typing import List
+import operator
+from typing import List, Optional
 
 from app import lox
 from app.environment import Environment
@@ -14,27 +15,71 @@ from app.expr import (
     Unary,
     Variable,
 )
+from app.output import Output
 from app.scanner import ValidToken, ValidTokenType
 from app.stmt import Block, Expression, If, Print, Stmt, StmtVisitor, Var, While
+from app.strings import NUMBERS, STRINGS, concat
+
+
+# NB: a Binary node whose operands had the same kind of type this many times in
+# a row is specialized; one that falls back this often stays generic for good
+WARMUP = 8
+MAX_DEOPTS = 4
+_GUARDS = (NUMBERS, STRINGS)
+_SPECIALIZED = {
+    (ValidTokenType.PLUS, NUMBERS): operator.add,
+    (ValidTokenType.MINUS, NUMBERS): operator.sub,
+    (ValidTokenType.STAR, NUMBERS): operator.mul,
+    (ValidTokenType.SLASH, NUMBERS): operator.truediv,
+    (ValidTokenType.GREATER, NUMBERS): operator.gt,
+    (ValidTokenType.GREATER_EQUAL, NUMBERS): operator.ge,
+    (ValidTokenType.LESS, NUMBERS): operator.lt,
+    (ValidTokenType.LESS_EQUAL, NUMBERS): operator.le,
+    (ValidTokenType.EQUAL_EQUAL, NUMBERS): operator.eq,
+    (ValidTokenType.BANG_EQUAL, NUMBERS): operator.ne,
+    (ValidTokenType.PLUS, STRINGS): concat,
+    (ValidTokenType.EQUAL_EQUAL, STRINGS): operator.eq,
+    (ValidTokenType.BANG_EQUAL, STRINGS): operator.ne,
+}
 
 
 class Interpreter(ExprVisitor, StmtVisitor):
-    def __init__(self):
+    # NB: subclasses that account for every statement or iteration turn this off
+    fuse_loops = True
+
+    def __init__(
+        self,
+        output: Optional[Output] = None,
+        reporter: Optional["lox.LoxSession"] = None,
+    ):
         self._environment = Environment()
+        self.output = output if output is not None else Output()
+        self.reporter = reporter
 
     def interpret_expr(self, expr: Expr) -> None:
         try:
             value = self.evaluate(expr)
-            print(self.stringify(value))
+            self.output.write_line(self.stringify(value))
         except RuntimeError_ as error:
-            lox.Lox.runtime_error(error)
+            self.runtime_error(error)
+        finally:
+            self.output.flush()
 
     def interpret(self, statements: List[Stmt]) -> None:
         try:
             for statement in statements:
                 self.execute(statement)
         except RuntimeError_ as error:
-            lox.Lox.runtime_error(error)
+            self.runtime_error(error)
+        finally:
+            self.output.flush()
+
+    def runtime_error(self, error: RuntimeError_) -> None:
+        # NB: whatever was printed before the error must reach stdout before
+        # the report reaches stderr
+        self.output.flush()
+        reporter = self.reporter if self.reporter is not None else lox.Lox.session
+        reporter.runtime_error(error)
 
     def stringify(self, value: object) -> str:
         if value is None:
@@ -46,7 +91,7 @@ class Interpreter(ExprVisitor, StmtVisitor):
         elif type(value) is float:
             return f"{int(value) if int(value) == value else value}"
         else:
-            return value
+            return str(value)
 
     def execute(self, stmt: Stmt) -> None:
         stmt.accept(self)
@@ -95,10 +140,51 @@ class Interpreter(ExprVisitor, StmtVisitor):
 
     def visit_print_stmt(self, stmt: Print) -> None:
         value = self.evaluate(stmt.expression)
-        print(self.stringify(value))
+        self.output.write_line(self.stringify(value))
 
     def visit_block_stmt(self, stmt: Block) -> None:
-        self.execute_block(stmt.statements, Environment(self._environment))
+        if stmt.size == 0:
+            for statement in stmt.statements:
+                self.execute(statement)
+            return
+        if stmt.loop is not None and self.fuse_loops:
+            self.execute_counted_loop(stmt)
+            return
+
+        self.execute_block(stmt.statements, Environment(self._environment, stmt.size))
+
+    def execute_counted_loop(self, stmt: Block) -> None:
+        loop = stmt.loop
+        slot = loop.declaration.slot
+        previous = self._environment
+        try:
+            self._environment = environment = Environment(previous, stmt.size)
+            self.execute(loop.declaration)
+
+            counter = environment.values[slot]
+            if type(counter) not in NUMBERS:
+                self.execute(loop.loop)
+                return
+
+            # NB: the counter lives in a Python local and is copied back to the
+            # Lox variable before every pass through the body, which never
+            # assigns it
+            values, body, limit = environment.values, loop.body, loop.limit
+            compare, step, operator = loop.compare, loop.step, loop.operator
+            constant = isinstance(limit, Literal)
+            bound = limit.constant if constant else None
+            while True:
+                if not constant:
+                    bound = self.evaluate(limit)
+                if type(bound) not in NUMBERS:
+                    self.check_number_operands(operator, counter, bound)
+                if not compare(counter, bound):
+                    break
+                self.execute(body)
+                counter += step
+                values[slot] = counter
+        finally:
+            self._environment = previous
 
     def visit_while_stmt(self, stmt: While) -> None:
         while self.is_truthy(self.evaluate(stmt.condition)):
@@ -119,33 +205,20 @@ class Interpreter(ExprVisitor, StmtVisitor):
         if stmt.initializer is not None:
             value = self.evaluate(stmt.initializer)
 
-        self._environment.define(stmt.name.lexeme, value)
+        self._environment.define(stmt.slot, value)
 
     def visit_assign_expr(self, expr: Assign):
         value = self.evaluate(expr.value)
-        self._environment.assign(expr.name, value)
+        self._environment.assign_at(expr.depth, expr.slot, expr.name, value)
         return value
 
     def visit_literal_expr(self, expr: Literal) -> object:
-        if expr.value.type is ValidTokenType.INTEGER:
-            return int(float(expr.value.literal))
-        elif expr.value.type is ValidTokenType.FLOAT:
-            return float(expr.value.literal)
-        elif expr.value.type is ValidTokenType.TRUE:
-            return True
-        elif expr.value.type is ValidTokenType.FALSE:
-            return False
-        elif expr.value.type is ValidTokenType.NIL:
-            return None
-        if expr.value.literal is not None:
-            return expr.value.literal
-        else:
-            return expr.value.lexeme
+        return expr.constant
 
     def visit_logical_expr(self, expr: Logical) -> object:
         left = self.evaluate(expr.left)
 
-        if expr.operator.type == ValidTokenType.OR:
+        if expr.op == ValidTokenType.OR:
             if self.is_truthy(left):
                 return left
         else:
@@ -160,21 +233,59 @@ class Interpreter(ExprVisitor, StmtVisitor):
     def visit_unary_expr(self, expr: Unary) -> object:
         right = self.evaluate(expr.right)
 
-        match expr.operator.type:
+        match expr.op:
             case ValidTokenType.MINUS:
-                self.check_number_operand(expr.operator, right)
+                if type(right) not in NUMBERS:
+                    self.check_number_operand(expr.operator, right)
                 return -right
             case ValidTokenType.BANG:
                 return not self.is_truthy(right)
 
     def visit_variable_expr(self, expr: Variable) -> object:
-        return self._environment.get(expr.name)
+        return self._environment.get_at(expr.depth, expr.slot, expr.name)
 
-    def visit_binary_expr(self, expr: Binary) -> str:
+    def visit_binary_expr(self, expr: Binary) -> object:
         left = self.evaluate(expr.left)
         right = self.evaluate(expr.right)
 
-        match expr.operator.type:
+        fast = expr.fast
+        if fast is not None:
+            guard = expr.guard
+            if type(left) in guard and type(right) in guard:
+                return fast(left, right)
+            self.deoptimize(expr)
+        elif expr.streak >= 0:
+            self.record_types(expr, left, right)
+
+        return self.binary(expr, left, right)
+
+    def record_types(self, expr: Binary, left: object, right: object) -> None:
+        for guard in _GUARDS:
+            if type(left) in guard and type(right) in guard:
+                break
+        else:
+            expr.streak = 0
+            return
+
+        if guard is not expr.guard:
+            expr.guard = guard
+            expr.streak = 0
+        expr.streak += 1
+        if expr.streak < WARMUP:
+            return
+
+        expr.fast = _SPECIALIZED.get((expr.op, guard))
+        if expr.fast is None:
+            # NB: nothing to specialize to, e.g. "-" on strings; stop recording
+            expr.streak = -1
+
+    def deoptimize(self, expr: Binary) -> None:
+        expr.fast = None
+        expr.deopts += 1
+        expr.streak = 0 if expr.deopts < MAX_DEOPTS else -1
+
+    def binary(self, expr: Binary, left: object, right: object) -> object:
+        match expr.op:
             case ValidTokenType.GREATER:
                 self.check_number_operands(expr.operator, left, right)
                 return left > right
@@ -195,8 +306,8 @@ class Interpreter(ExprVisitor, StmtVisitor):
             case ValidTokenType.EQUAL_EQUAL:
                 return self.is_equal(left, right)
             case ValidTokenType.PLUS:
-                if isinstance(left, str) and isinstance(right, str):
-                    return left + right
+                if type(left) in STRINGS and type(right) in STRINGS:
+                    return concat(left, right)
                 self.check_number_operands(expr.operator, left, right)
                 return left + right
             case ValidTokenType.SLASH:
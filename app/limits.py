@@ -0,0 +1,124 @@
+from math import inf
+from time import monotonic
+from typing import List, Optional
+
+from app import lox
+from app.error import (
+    IterationLimitError,
+    StatementLimitError,
+    StringLimitError,
+    TimeLimitError,
+)
+from app.expr import Binary, Expr
+from app.interpreter import Interpreter
+from app.output import Output
+from app.profiler import LineFinder, Node
+from app.stmt import Stmt, While
+from app.strings import STRINGS
+
+# NB: how many statements or loop iterations may pass between two looks at the
+# clock; counting limits are still enforced exactly
+CHECK_INTERVAL = 1 << 10
+
+
+class Limits:
+    def __init__(
+        self,
+        max_statements: Optional[int] = None,
+        max_iterations: Optional[int] = None,
+        time_limit: Optional[float] = None,
+        max_string_length: Optional[int] = None,
+    ):
+        self.max_statements = max_statements
+        self.max_iterations = max_iterations
+        self.time_limit = time_limit
+        self.max_string_length = max_string_length
+
+
+# NB: like profiling, governing lives in a subclass so unlimited runs pay
+# nothing for it
+class GovernedInterpreter(Interpreter):
+    fuse_loops = False
+
+    def __init__(
+        self,
+        output: Optional[Output] = None,
+        reporter: Optional["lox.LoxSession"] = None,
+        limits: Optional[Limits] = None,
+    ):
+        super().__init__(output, reporter)
+        self.limits = limits if limits is not None else Limits()
+        self._lines = LineFinder()
+        self.start()
+
+    def start(self) -> None:
+        time_limit = self.limits.time_limit
+        self._deadline = monotonic() + time_limit if time_limit is not None else None
+        self._statements = 0
+        self._iterations = 0
+        self._statement_checkpoint = self.next_checkpoint(0, self.limits.max_statements)
+        self._iteration_checkpoint = self.next_checkpoint(0, self.limits.max_iterations)
+
+    def next_checkpoint(self, count: int, limit: Optional[int]) -> float:
+        checkpoint = count + CHECK_INTERVAL if self._deadline is not None else inf
+        return checkpoint if limit is None else min(checkpoint, limit)
+
+    def checkpoint(self, node: Node) -> None:
+        limits = self.limits
+        max_statements, max_iterations = limits.max_statements, limits.max_iterations
+
+        if max_statements is not None and self._statements > max_statements:
+            raise StatementLimitError(
+                self._lines.line(node),
+                f"Exceeded the limit of {max_statements} executed statements.",
+            )
+        if max_iterations is not None and self._iterations > max_iterations:
+            raise IterationLimitError(
+                self._lines.line(node),
+                f"Exceeded the limit of {max_iterations} loop iterations.",
+            )
+        if self._deadline is not None and monotonic() > self._deadline:
+            raise TimeLimitError(
+                self._lines.line(node),
+                f"Exceeded the time limit of {limits.time_limit:g}s.",
+            )
+
+        self._statement_checkpoint = self.next_checkpoint(
+            self._statements, max_statements
+        )
+        self._iteration_checkpoint = self.next_checkpoint(
+            self._iterations, max_iterations
+        )
+
+    def interpret_expr(self, expr: Expr) -> None:
+        self.start()
+        super().interpret_expr(expr)
+
+    def interpret(self, statements: List[Stmt]) -> None:
+        self.start()
+        super().interpret(statements)
+
+    def execute(self, stmt: Stmt) -> None:
+        self._statements += 1
+        if self._statements > self._statement_checkpoint:
+            self.checkpoint(stmt)
+        stmt.accept(self)
+
+    def visit_while_stmt(self, stmt: While) -> None:
+        while self.is_truthy(self.evaluate(stmt.condition)):
+            self._iterations += 1
+            if self._iterations > self._iteration_checkpoint:
+                self.checkpoint(stmt)
+            self.execute(stmt.body)
+
+    def visit_binary_expr(self, expr: Binary) -> object:
+        value = super().visit_binary_expr(expr)
+
+        limit = self.limits.max_string_length
+        if limit is not None and type(value) in STRINGS and len(value) > limit:
+            raise StringLimitError(
+                expr.line,
+                f"Exceeded the maximum string length of {limit}.",
+            )
+
+        return value
@@ -0,0 +1,171 @@
+import operator
+from typing import Callable, Optional
+
+from app.expr import (
+    Assign,
+    Binary,
+    Expr,
+    ExprVisitor,
+    Grouping,
+    Literal,
+    Logical,
+    Unary,
+    Variable,
+)
+from app.scanner import ValidToken, ValidTokenType
+from app.stmt import Block, Expression, If, Print, Stmt, StmtVisitor, Var, While
+from app.strings import NUMBERS
+
+
+COMPARISONS = {
+    ValidTokenType.GREATER: operator.gt,
+    ValidTokenType.GREATER_EQUAL: operator.ge,
+    ValidTokenType.LESS: operator.lt,
+    ValidTokenType.LESS_EQUAL: operator.le,
+}
+
+
+# NB: the shape Parser.for_statement gives "for (var i = a; i < b; i = i + c)":
+# Block([Var(i, a), While(i < b, Block([body, Expression(i = i + c)]))])
+class CountedLoop:
+    def __init__(
+        self,
+        declaration: Var,
+        loop: While,
+        body: Stmt,
+        operator: ValidToken,
+        compare: Callable[[object, object], bool],
+        limit: Expr,
+        step: object,
+    ):
+        self.declaration = declaration
+        self.loop = loop
+        self.body = body
+        self.operator = operator
+        self.compare = compare
+        self.limit = limit
+        self.step = step
+
+
+class AssignmentFinder(ExprVisitor, StmtVisitor):
+    def __init__(self, name: str):
+        self.name = name
+
+    def assigns(self, node: Expr | Stmt) -> bool:
+        return node.accept(self)
+
+    def visit_expression_stmt(self, stmt: Expression) -> bool:
+        return self.assigns(stmt.expression)
+
+    def visit_print_stmt(self, stmt: Print) -> bool:
+        return self.assigns(stmt.expression)
+
+    def visit_var_stmt(self, stmt: Var) -> bool:
+        return stmt.initializer is not None and self.assigns(stmt.initializer)
+
+    def visit_block_stmt(self, stmt: Block) -> bool:
+        return any(self.assigns(statement) for statement in stmt.statements)
+
+    def visit_if_stmt(self, stmt: If) -> bool:
+        return (
+            self.assigns(stmt.condition)
+            or self.assigns(stmt.then_branch)
+            or (stmt.else_branch is not None and self.assigns(stmt.else_branch))
+        )
+
+    def visit_while_stmt(self, stmt: While) -> bool:
+        return self.assigns(stmt.condition) or self.assigns(stmt.body)
+
+    def visit_assign_expr(self, expr: Assign) -> bool:
+        return expr.name.lexeme == self.name or self.assigns(expr.value)
+
+    def visit_binary_expr(self, expr: Binary) -> bool:
+        return self.assigns(expr.left) or self.assigns(expr.right)
+
+    def visit_grouping_expr(self, expr: Grouping) -> bool:
+        return self.assigns(expr.expression)
+
+    def visit_literal_expr(self, expr: Literal) -> bool:
+        return False
+
+    def visit_logical_expr(self, expr: Logical) -> bool:
+        return self.assigns(expr.left) or self.assigns(expr.right)
+
+    def visit_unary_expr(self, expr: Unary) -> bool:
+        return self.assigns(expr.right)
+
+    def visit_variable_expr(self, expr: Variable) -> bool:
+        return False
+
+
+def is_counter(expr: Expr, declaration: Var) -> bool:
+    return (
+        isinstance(expr, Variable)
+        and expr.name.lexeme == declaration.name.lexeme
+        and expr.depth == 0
+        and expr.slot == declaration.slot
+    )
+
+
+def counted_loop(block: Block) -> Optional[CountedLoop]:
+    if len(block.statements) != 2:
+        return None
+    declaration, loop = block.statements
+    if not isinstance(declaration, Var) or not isinstance(loop, While):
+        return None
+
+    condition = loop.condition
+    if (
+        not isinstance(condition, Binary)
+        or condition.op not in COMPARISONS
+        or not is_counter(condition.left, declaration)
+    ):
+        return None
+    # NB: the limit is evaluated every iteration, but must not touch the counter
+    limit = condition.right
+    if not isinstance(limit, (Literal, Variable)):
+        return None
+    if isinstance(limit, Variable) and limit.name.lexeme == declaration.name.lexeme:
+        return None
+
+    if not isinstance(loop.body, Block) or not loop.body.statements:
+        return None
+    # NB: the optimizer may have spliced the loop body into the increment block
+    *statements, increment = loop.body.statements
+    body = statements[0] if len(statements) == 1 else Block(statements, loop.body.line)
+    if not isinstance(increment, Expression) or not isinstance(
+        increment.expression, Assign
+    ):
+        return None
+
+    assign = increment.expression
+    update = assign.value
+    if (
+        assign.name.lexeme != declaration.name.lexeme
+        or assign.depth != 0
+        or assign.slot != declaration.slot
+        or not isinstance(update, Binary)
+        or update.op not in (ValidTokenType.PLUS, ValidTokenType.MINUS)
+        or not is_counter(update.left, declaration)
+        or not isinstance(update.right, Literal)
+        or type(update.right.constant) not in NUMBERS
+    ):
+        return None
+
+    # NB: a body that reassigns the counter runs the loop as written
+    if AssignmentFinder(declaration.name.lexeme).assigns(body):
+        return None
+
+    step = update.right.constant
+    if update.op == ValidTokenType.MINUS:
+        step = -step
+
+    return CountedLoop(
+        declaration,
+        loop,
+        body,
+        condition.operator,
+        COMPARISONS[condition.op],
+        limit,
+        step,
+    )
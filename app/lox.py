@@ -1,15 +1,142 @@
-from app.parser import Parser
-from app.scanner import Scanner, ValidToken, ValidTokenType
-from app.interpreter import Interpreter
-from app.error import RuntimeError_
-from sys import stderr
-from typing import List
+import sys
+from importlib import import_module
+from app.scanner import Scanner, StreamScanner, ValidToken, ValidTokenType
+from app.output import Output
+from typing import TYPE_CHECKING, Iterator, List, Optional, Sequence, TextIO
 
+# NB: everything past the scanner is imported where it is first needed, so a
+# short-lived process only pays for the stages its command actually runs
+if TYPE_CHECKING:
+    from app.cache import AstCache
+    from app.error import RuntimeError_
+    from app.expr import Expr
+    from app.interpreter import Interpreter
+    from app.limits import Limits
+    from app.resolver import Resolver
+    from app.stmt import Stmt
 
-class Lox:
-    _interpreter: Interpreter = Interpreter()
-    had_error: bool = False
-    had_runtime_error: bool = False
+
+# NB: scripts this large are scanned and parsed in chunks when parse_jobs is set
+PARALLEL_MIN_BYTES = 1 << 20
+
+ENGINES = {
+    "tree": ("app.interpreter", "Interpreter"),
+    "closure": ("app.closures", "ClosureInterpreter"),
+    "vm": ("app.vm", "VMInterpreter"),
+}
+
+
+def engine_class(engine: str) -> type:
+    module, name = ENGINES[engine]
+    return getattr(import_module(module), name)
+
+
+class Diagnostic:
+    def __init__(self, line: int, message: str, where: Optional[str] = None):
+        self.line = line
+        self.message = message
+        # NB: only static (scan and parse) errors point at a location
+        self.where = where
+
+    @property
+    def is_runtime(self) -> bool:
+        return self.where is None
+
+    def __str__(self) -> str:
+        if self.is_runtime:
+            return f"{self.message}\n[line {self.line}]"
+        return f"[line {self.line}] Error{self.where}: {self.message}"
+
+
+class RunResult:
+    def __init__(self, exit_code: int, errors: List[Diagnostic]):
+        self.exit_code = exit_code
+        self.errors = errors
+
+    @property
+    def ok(self) -> bool:
+        return self.exit_code == 0
+
+
+class LoxSession:
+    def __init__(
+        self,
+        engine: str = "tree",
+        opt_level: int = 0,
+        stdout: Optional[TextIO] = None,
+        stderr: Optional[TextIO] = None,
+        flush: str = "block",
+        cache: Optional["AstCache"] = None,
+        profile: bool = False,
+        limits: Optional["Limits"] = None,
+        parse_jobs: Optional[int] = None,
+        **options,
+    ):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine: {engine}")
+        if limits is not None:
+            options["limits"] = limits
+        self.engine = engine
+        self.profile = profile
+        self._options = options
+        self._output = Output(stdout, flush)
+        # NB: missing streams mean whatever sys.stdout / sys.stderr are at
+        # write time
+        self._stderr = stderr
+        # NB: built on first use, tokenizing and parsing never need them
+        self._interpreter: Optional["Interpreter"] = None
+        self._resolver: Optional["Resolver"] = None
+        self.opt_level = opt_level
+        self.cache = cache
+        self.parse_jobs = parse_jobs
+        self.had_error = False
+        self.had_runtime_error = False
+        self.errors: List[Diagnostic] = []
+
+    @property
+    def interpreter(self) -> "Interpreter":
+        if self._interpreter is None:
+            # NB: profiling and resource limits instrument the tree-walking
+            # interpreter only
+            if self.profile:
+                from app.profiler import ProfilingInterpreter as interpreter_class
+            elif "limits" in self._options:
+                from app.limits import GovernedInterpreter as interpreter_class
+            else:
+                interpreter_class = engine_class(self.engine)
+            self._interpreter = interpreter_class(
+                output=self._output, reporter=self, **self._options
+            )
+        return self._interpreter
+
+    @interpreter.setter
+    def interpreter(self, interpreter: "Interpreter") -> None:
+        self._interpreter = interpreter
+
+    @property
+    def resolver(self) -> "Resolver":
+        # NB: holds the global scope, so it lives as long as the session
+        if self._resolver is None:
+            from app.resolver import Resolver
+
+            self._resolver = Resolver()
+        return self._resolver
+
+    @resolver.setter
+    def resolver(self, resolver: "Resolver") -> None:
+        self._resolver = resolver
+
+    @property
+    def stderr(self) -> TextIO:
+        return self._stderr if self._stderr is not None else sys.stderr
+
+    @property
+    def exit_code(self) -> int:
+        if self.had_error:
+            return 65
+        if self.had_runtime_error:
+            return 70
+        return 0
 
     @staticmethod
     def read_file(path: str) -> str:
@@ -17,58 +144,152 @@ class Lox:
             source = file.read()
         return source
 
-    @staticmethod
-    def tokenize(source: str) -> List[ValidToken]:
-        scanner = Scanner(source)
+    def tokenize(self, source: str, line: int = 1) -> Sequence[ValidToken]:
+        scanner = Scanner(source, self, line)
         tokens = scanner.scan()
 
         return tokens
 
-    @staticmethod
-    def parse(tokens: List[ValidToken]) -> None:
-        parser = Parser(tokens)
+    def stream_tokens(self, stream: TextIO) -> Iterator[ValidToken]:
+        return iter(StreamScanner(stream, self))
+
+    def parse(self, tokens: Sequence[ValidToken]) -> List["Stmt"]:
+        from app.parser import Parser
+
+        parser = Parser(tokens, self)
         statements = parser.parse()
 
         return statements
 
-    @classmethod
-    def run_file(cls, path: str) -> None:
-        source = cls.read_file(path)
-        cls.run(source)
+    def parse_expr(self, tokens: Sequence[ValidToken]) -> Optional["Expr"]:
+        from app.parser import Parser
 
-        if cls.had_error:
-            exit(65)
+        parser = Parser(tokens, self)
+        expr = parser.expr()
 
-        if cls.had_runtime_error:
-            exit(70)
+        return expr
 
-    @classmethod
-    def run(cls, source: str) -> None:
-        tokens = cls.tokenize(source)
-        statements = cls.parse(tokens)
+    def parse_repl_expr(self, tokens: Sequence[ValidToken]) -> Optional["Expr"]:
+        from app.parser import Parser
 
-        if cls.had_error:
-            return
+        return Parser(tokens, self).repl_expr()
 
-        cls._interpreter.interpret(statements)
+    def compile(self, source: str) -> List["Stmt"]:
+        if self.cache is not None:
+            statements = self.cache.load(source)
+            if statements is not None:
+                return statements
 
-    @classmethod
-    def error1(cls, line: int, message: str):
-        cls.report(line, "", message)
+        statements = None
+        parallel = self.parse_jobs is not None and self.parse_jobs > 1
+        if parallel and len(source) >= PARALLEL_MIN_BYTES:
+            from app.parallel import parse_parallel
 
-    @classmethod
-    def error2(cls, token: ValidToken, message: str):
+            statements = parse_parallel(source, self.parse_jobs)
+        if statements is None:
+            tokens = self.tokenize(source)
+            statements = self.parse(tokens)
+
+        # NB: only clean parses are cached, a hit must report nothing
+        if self.cache is not None and not self.had_error:
+            self.cache.store(source, statements)
+
+        return statements
+
+    @staticmethod
+    def optimize(statements: List["Stmt"]) -> List["Stmt"]:
+        from app.optimizer import Optimizer
+
+        return Optimizer().optimize(statements)
+
+    def resolve(self, statements: List["Stmt"]) -> None:
+        self.resolver.resolve(statements)
+
+    def reset(self) -> None:
+        self.had_error = False
+        self.had_runtime_error = False
+        self.errors = []
+
+    def run_file(self, path: str) -> RunResult:
+        source = self.read_file(path)
+        return self.run(source)
+
+    # NB: each stage runs once and hands its product to the next one; the
+    # entry points below differ only in where they stop
+
+    def evaluate(self, source: str, repl: bool = False) -> RunResult:
+        self.reset()
+        tokens = self.tokenize(source)
+        expr = self.parse_repl_expr(tokens) if repl else self.parse_expr(tokens)
+
+        if not self.had_error:
+            self.resolver.resolve_expr(expr)
+            self.interpreter.interpret_expr(expr)
+
+        return RunResult(self.exit_code, self.errors)
+
+    def run(self, source: str) -> RunResult:
+        # NB: globals persist from one run to the next, error state does not
+        self.reset()
+        statements = self.compile(source)
+
+        if not self.had_error:
+            if self.opt_level > 0:
+                statements = self.optimize(statements)
+            self.resolve(statements)
+            self.interpreter.interpret(statements)
+
+        return RunResult(self.exit_code, self.errors)
+
+    def error1(self, line: int, message: str):
+        self.report(line, "", message)
+
+    def error2(self, token: ValidToken, message: str):
         if token.type == ValidTokenType.EOF:
-            cls.report(token.line, " at end", message)
+            self.report(token.line, " at end", message)
         else:
-            cls.report(token.line, f" at '{token.lexeme}'", message)
+            self.report(token.line, f" at '{token.lexeme}'", message)
+
+    def report(self, line: int, where: str, message: str) -> None:
+        self.diagnose(Diagnostic(line, message, where))
+        self.had_error = True
+
+    def runtime_error(self, error: "RuntimeError_") -> None:
+        self.diagnose(Diagnostic(error.line, error.args[0]))
+        self.had_runtime_error = True
+
+    def diagnose(self, diagnostic: Diagnostic) -> None:
+        self.errors.append(diagnostic)
+        print(diagnostic, file=self.stderr)
+
+
+class _DefaultSession:
+    # NB: creates the default session on first access and then replaces
+    # itself with it, so importing this module builds nothing
+    def __get__(self, instance: None, owner: type) -> LoxSession:
+        session = LoxSession()
+        setattr(owner, "session", session)
+        return session
+
+
+class Lox:
+    # NB: the command line drives a single process-wide session and turns its
+    # results into exit codes; embedders create their own LoxSession instead
+    session: LoxSession = _DefaultSession()
+
+    @classmethod
+    def run(cls, source: str) -> None:
+        cls.exit_on_failure(cls.session.run(source))
 
     @classmethod
-    def report(cls, line: int, where: str, message: str) -> None:
-        print(f"[line {line}] Error{where}: {message}", file=stderr)
-        cls.had_error = True
+    def evaluate(cls, source: str) -> None:
+        cls.exit_on_failure(cls.session.evaluate(source))
+
+    @classmethod
+    def run_file(cls, path: str) -> None:
+        cls.exit_on_failure(cls.session.run_file(path))
 
     @staticmethod
-    def runtime_error(error: RuntimeError_) -> None:
-        print(f"{error.args[0]}\n[line {error.token.line}]", file=stderr)
-        exit(70)
+    def exit_on_failure(result: RunResult) -> None:
+        if not result.ok:
+            exit(result.exit_code)
@@ -1,63 +1,287 @@
-from app.lox import Lox
-from argparse import ArgumentParser
-from app.parser import Parser
-from app.ast_printer import AstPrinter
-from app.interpreter import Interpreter
+from app.lox import ENGINES, Lox, LoxSession
+import sys
+from app.output import FLUSH_POLICIES
 from app.scanner import ValidToken
-from typing import List
+from typing import TYPE_CHECKING, Iterable, Optional, Sequence
 
+# NB: each command imports what it needs when it runs; see
+# benchmarks/startup.py
+if TYPE_CHECKING:
+    from argparse import Namespace
+    from app.limits import Limits
+    from app.profiler import Profile
 
-def print_tokens(tokens: List[ValidToken]) -> List[ValidToken]:
+# NB: "<command> <file>" with no options is by far the most common invocation
+# and skips argparse altogether
+FAST_COMMANDS = ("tokenize", "parse", "evaluate", "run")
+
+
+def print_tokens(tokens: Iterable[ValidToken]) -> None:
     for token in tokens:
         print(token)
-    if Lox.had_error:
+    if Lox.session.had_error:
         exit(65)
 
 
-def print_expr(tokens: List[ValidToken]) -> None:
-    parser = Parser(tokens)
-    expr = parser.expr()
+def print_expr(tokens: Sequence[ValidToken]) -> None:
+    from app.ast_printer import AstPrinter
+
+    expr = Lox.session.parse_expr(tokens)
     printer = AstPrinter()
 
-    if Lox.had_error:
+    if Lox.session.had_error:
         exit(65)
     print(printer.print(expr))
 
 
-def evaluate_expr(tokens: List[ValidToken]) -> None:
-    parser = Parser(tokens)
-    expr = parser.expr()
-    interpreter = Interpreter()
+def run_batch_command(args: "Namespace") -> None:
+    from app.batch import collect_scripts, run_batch, write_results
 
-    if Lox.had_error:
-        exit(65)
-    interpreter.interpret_expr(expr)
+    paths = collect_scripts(args.filename)
+    results = run_batch(
+        paths,
+        args.jobs,
+        args.timeout,
+        args.engine,
+        args.opt_level,
+        args.cache_dir,
+        limits_from(args),
+        args.cache_max_bytes,
+    )
+
+    if args.output is None:
+        failed = write_results(results, sys.stdout)
+    else:
+        with open(args.output, "w") as out:
+            failed = write_results(results, out)
+
+    if failed:
+        exit(1)
+
+
+def limits_from(args: "Namespace") -> Optional["Limits"]:
+    if (
+        args.max_statements is None
+        and args.max_iterations is None
+        and args.time_limit is None
+        and args.max_string_length is None
+    ):
+        return None
+
+    from app.limits import Limits
+
+    return Limits(
+        args.max_statements,
+        args.max_iterations,
+        args.time_limit,
+        args.max_string_length,
+    )
+
+
+def report_profile(profile: "Profile", args: "Namespace") -> None:
+    print(profile.report(), file=sys.stderr)
+    if args.profile_output is not None:
+        profile.dump(args.profile_output, args.filename)
+
+
+def run_command(command: str, filename: str, args: Optional["Namespace"] = None):
+    if command == "tokenize":
+        with open(filename) as file:
+            print_tokens(Lox.session.stream_tokens(file))
+        return
+
+    source = Lox.session.read_file(filename)
+
+    if command == "parse":
+        print_expr(Lox.session.tokenize(source))
+    if command == "evaluate":
+        Lox.evaluate(source)
+    if command == "run":
+        result = Lox.session.run(source)
+        if args is not None and args.cache_stats and Lox.session.cache is not None:
+            print(Lox.session.cache.stats(), file=sys.stderr)
+        if args is not None and args.profile:
+            report_profile(Lox.session.interpreter.profile, args)
+        Lox.exit_on_failure(result)
 
 
 def main():
+    argv = sys.argv[1:]
+    if len(argv) == 2 and argv[0] in FAST_COMMANDS and not argv[1].startswith("-"):
+        run_command(*argv)
+        return
+
+    from argparse import ArgumentParser
+
     # Create the parser
     parser = ArgumentParser(description="Lox parser")
 
     # Add arguments
     parser.add_argument(
-        "command", choices=["tokenize", "parse", "evaluate", "run"], help="Command"
+        "command",
+        choices=["tokenize", "parse", "evaluate", "run", "batch", "repl"],
+        help="Command",
+    )
+    parser.add_argument(
+        "filename",
+        type=str,
+        nargs="?",
+        help="Sourcefile (for batch: a script, directory, glob or manifest of scripts)",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=list(ENGINES),
+        default="tree",
+        help="Execution engine for the run and batch commands",
+    )
+    parser.add_argument(
+        "-O",
+        "--opt-level",
+        type=int,
+        choices=[0, 1],
+        default=0,
+        help="Fold constants and drop dead branches before running (level 1)",
+    )
+    parser.add_argument(
+        "--flush",
+        choices=FLUSH_POLICIES,
+        default="block",
+        help="When buffered program output is written to stdout",
+    )
+    parser.add_argument(
+        "--disassemble",
+        action="store_true",
+        help="Print the compiled bytecode to stderr (vm engine only)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Reuse parsed programs from (and store them in) this directory",
+    )
+    parser.add_argument(
+        "--cache-max-bytes",
+        type=int,
+        default=64 << 20,
+        help="Evict least recently used cache entries beyond this size",
+    )
+    parser.add_argument(
+        "--cache-stats",
+        action="store_true",
+        help="Print cache hit/miss statistics to stderr after running",
+    )
+    parser.add_argument(
+        "--parse-jobs",
+        type=int,
+        default=None,
+        help="Scan and parse scripts of 1 MiB or more in this many processes",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Report hot lines, node types and loop counts to stderr (tree engine)",
+    )
+    parser.add_argument(
+        "--profile-output",
+        type=str,
+        default=None,
+        help="Also save the profile as JSON (*.json) or in pstats format",
+    )
+    parser.add_argument(
+        "--max-statements",
+        type=int,
+        default=None,
+        help="Stop a script after this many executed statements (tree engine)",
+    )
+    parser.add_argument(
+        "--max-iterations",
+        type=int,
+        default=None,
+        help="Stop a script after this many loop iterations (tree engine)",
+    )
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        default=None,
+        help="Stop a script after this many seconds of execution (tree engine)",
+    )
+    parser.add_argument(
+        "--max-string-length",
+        type=int,
+        default=None,
+        help="Stop a script that builds a longer string (tree engine)",
+    )
+    parser.add_argument(
+        "--time",
+        action="store_true",
+        help="Report how long each input took (repl; toggle with :time)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Worker processes for the batch command (default: one per core)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Per-script time limit in seconds for the batch command",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default=None,
+        help="Where the batch command writes its JSON lines (default: stdout)",
     )
-    parser.add_argument("filename", type=str, help="Sourcefile")
 
     # Parse arguments
-    args = parser.parse_args()
-
-    source = Lox.read_file(args.filename)
-    tokens = Lox.tokenize(source)
-
-    if args.command == "tokenize":
-        print_tokens(tokens)
-    if args.command == "parse":
-        print_expr(tokens)
-    if args.command == "evaluate":
-        evaluate_expr(tokens)
-    if args.command == "run":
-        Lox.run_file(args.filename)
+    args = parser.parse_intermixed_args()
+    if args.filename is None and args.command != "repl":
+        parser.error(f"{args.command} requires a filename")
+    if args.disassemble and args.engine != "vm":
+        parser.error("--disassemble requires --engine=vm")
+    if args.parse_jobs is not None and args.parse_jobs < 1:
+        parser.error("--parse-jobs must be at least 1")
+    if args.profile_output is not None:
+        args.profile = True
+    if args.profile and args.engine != "tree":
+        parser.error("--profile requires --engine=tree")
+    limits = limits_from(args)
+    if limits is not None and args.engine != "tree":
+        parser.error("resource limits require --engine=tree")
+    if limits is not None and args.profile:
+        parser.error("resource limits cannot be combined with --profile")
+
+    if args.command == "batch":
+        run_batch_command(args)
+        return
+
+    if args.command in ("run", "repl"):
+        options = {"disassemble": True} if args.disassemble else {}
+        if args.cache_dir is not None:
+            from app.cache import AstCache
+
+            options["cache"] = AstCache(args.cache_dir, args.cache_max_bytes)
+        Lox.session = LoxSession(
+            args.engine,
+            args.opt_level,
+            flush=args.flush,
+            profile=args.profile,
+            limits=limits,
+            parse_jobs=args.parse_jobs,
+            **options,
+        )
+
+    if args.command == "repl":
+        from app.repl import Repl
+
+        Repl(Lox.session, timing=args.time).run()
+        return
+
+    run_command(args.command, args.filename, args)
 
 
 if __name__ == "__main__":
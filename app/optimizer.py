@@ -0,0 +1,186 @@
+from typing import List, Optional
+
+from app.error import RuntimeError_
+from app.expr import (
+    Assign,
+    Binary,
+    Expr,
+    ExprVisitor,
+    Grouping,
+    Literal,
+    Logical,
+    Unary,
+    Variable,
+)
+from app.interpreter import Interpreter
+from app.profiler import LineFinder
+from app.scanner import ValidToken, ValidTokenType
+from app.stmt import Block, Expression, If, Print, Stmt, StmtVisitor, Var, While
+from app.strings import Rope
+
+
+class Optimizer(ExprVisitor, StmtVisitor):
+    def __init__(self):
+        # NB: folding evaluates through the interpreter itself so that folded
+        # values follow exactly the same semantics as at runtime
+        self._interpreter = Interpreter()
+
+    def optimize(self, statements: List[Stmt]) -> List[Stmt]:
+        return self.optimize_all(statements)
+
+    def optimize_all(self, statements: List[Stmt]) -> List[Stmt]:
+        optimized = []
+        for statement in statements:
+            statement = statement.accept(self)
+            if statement is None:
+                continue
+            if isinstance(statement, Block) and not self.declares(statement):
+                # NB: a block without declarations adds nothing to scoping
+                optimized.extend(statement.statements)
+            else:
+                optimized.append(statement)
+
+        return optimized
+
+    def optimize_branch(self, stmt: Stmt) -> Optional[Stmt]:
+        stmt = stmt.accept(self)
+        if isinstance(stmt, Block) and not self.declares(stmt):
+            if not stmt.statements:
+                return None
+            if len(stmt.statements) == 1:
+                return stmt.statements[0]
+
+        return stmt
+
+    # NB: stands in for a branch that optimized away, on the line of the
+    # statement that owned it
+    def empty(self, stmt: Stmt) -> Block:
+        return Block([], LineFinder().line(stmt))
+
+    def declares(self, block: Block) -> bool:
+        return any(isinstance(statement, Var) for statement in block.statements)
+
+    def literal(self, value: object, line: int) -> Optional[Literal]:
+        if type(value) is Rope:
+            value = str(value)
+
+        if value is None:
+            return Literal(ValidToken(ValidTokenType.NIL, "nil", None, line))
+        elif value is True:
+            return Literal(ValidToken(ValidTokenType.TRUE, "true", None, line))
+        elif value is False:
+            return Literal(ValidToken(ValidTokenType.FALSE, "false", None, line))
+        elif type(value) is int:
+            literal = f"{value}.0"
+            # NB: integer literals are decoded through float at runtime, so
+            # only fold results that survive the round trip
+            try:
+                if int(float(literal)) != value:
+                    return None
+            except OverflowError:
+                return None
+            return Literal(ValidToken(ValidTokenType.INTEGER, str(value), literal, line))
+        elif type(value) is float:
+            return Literal(ValidToken(ValidTokenType.FLOAT, repr(value), repr(value), line))
+        elif type(value) is str:
+            return Literal(ValidToken(ValidTokenType.STRING, f'"{value}"', value, line))
+
+        return None
+
+    def fold(self, expr: Expr, line: int) -> Expr:
+        try:
+            value = self._interpreter.evaluate(expr)
+        except (RuntimeError_, ArithmeticError):
+            # NB: leave the error to be raised at runtime, on its own line
+            return expr
+
+        folded = self.literal(value, line)
+        return folded if folded is not None else expr
+
+    def visit_expression_stmt(self, stmt: Expression) -> Optional[Stmt]:
+        expression = stmt.expression.accept(self)
+        if isinstance(expression, Literal):
+            return None
+
+        return Expression(expression)
+
+    def visit_print_stmt(self, stmt: Print) -> Stmt:
+        return Print(stmt.expression.accept(self))
+
+    def visit_var_stmt(self, stmt: Var) -> Stmt:
+        initializer = stmt.initializer
+        if initializer is not None:
+            initializer = initializer.accept(self)
+
+        return Var(stmt.name, initializer)
+
+    def visit_block_stmt(self, stmt: Block) -> Stmt:
+        return Block(self.optimize_all(stmt.statements), stmt.line)
+
+    def visit_if_stmt(self, stmt: If) -> Optional[Stmt]:
+        condition = stmt.condition.accept(self)
+
+        if isinstance(condition, Literal):
+            if self._interpreter.is_truthy(condition.constant):
+                return self.optimize_branch(stmt.then_branch)
+            elif stmt.else_branch is not None:
+                return self.optimize_branch(stmt.else_branch)
+            return None
+
+        then_branch = self.optimize_branch(stmt.then_branch) or self.empty(stmt)
+        else_branch = None
+        if stmt.else_branch is not None:
+            else_branch = self.optimize_branch(stmt.else_branch)
+
+        return If(condition, then_branch, else_branch)
+
+    def visit_while_stmt(self, stmt: While) -> Optional[Stmt]:
+        condition = stmt.condition.accept(self)
+
+        if isinstance(condition, Literal) and not self._interpreter.is_truthy(
+            condition.constant
+        ):
+            return None
+
+        return While(condition, self.optimize_branch(stmt.body) or self.empty(stmt))
+
+    def visit_assign_expr(self, expr: Assign) -> Expr:
+        return Assign(expr.name, expr.value.accept(self))
+
+    def visit_binary_expr(self, expr: Binary) -> Expr:
+        expr = Binary(expr.left.accept(self), expr.operator, expr.right.accept(self))
+
+        if isinstance(expr.left, Literal) and isinstance(expr.right, Literal):
+            return self.fold(expr, expr.line)
+
+        return expr
+
+    def visit_grouping_expr(self, expr: Grouping) -> Expr:
+        # NB: grouping only matters to the parser and the AST printer
+        return expr.expression.accept(self)
+
+    def visit_literal_expr(self, expr: Literal) -> Expr:
+        return expr
+
+    def visit_logical_expr(self, expr: Logical) -> Expr:
+        left = expr.left.accept(self)
+        right = expr.right.accept(self)
+
+        if isinstance(left, Literal):
+            truthy = self._interpreter.is_truthy(left.constant)
+            if expr.op == ValidTokenType.OR:
+                return left if truthy else right
+            return right if truthy else left
+
+        return Logical(left, expr.operator, right)
+
+    def visit_unary_expr(self, expr: Unary) -> Expr:
+        expr = Unary(expr.operator, expr.right.accept(self))
+
+        if isinstance(expr.right, Literal):
+            return self.fold(expr, expr.line)
+
+        return expr
+
+    def visit_variable_expr(self, expr: Variable) -> Expr:
+        return Variable(expr.name)
@@ -0,0 +1,43 @@
+import sys
+from typing import List, Optional, TextIO
+
+FLUSH_POLICIES = ("line", "block", "end")
+
+
+class Output:
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        policy: str = "block",
+        size: int = 1 << 13,
+    ):
+        if policy not in FLUSH_POLICIES:
+            raise ValueError(f"Unknown flush policy: {policy}")
+
+        # NB: a missing stream means whatever sys.stdout is at flush time
+        self._stream = stream
+        self.policy = policy
+        self.size = size
+        self._lines: List[str] = []
+        self._pending = 0
+
+    @property
+    def stream(self) -> TextIO:
+        return self._stream if self._stream is not None else sys.stdout
+
+    def write_line(self, text: str) -> None:
+        self._lines.append(text)
+        if self.policy == "line":
+            self.flush()
+        elif self.policy == "block":
+            self._pending += len(text) + 1
+            if self._pending >= self.size:
+                self.flush()
+
+    def flush(self) -> None:
+        if self._lines:
+            self._lines.append("")
+            self.stream.write("\n".join(self._lines))
+            self._lines.clear()
+            self._pending = 0
+        self.stream.flush()
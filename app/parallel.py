@@ -0,0 +1,106 @@
+import gc
+import io
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+
+from app import lox
+from app.stmt import Stmt
+
+CHUNKS_PER_JOB = 2
+
+# NB: only strings and comments can hide the characters that matter here, and
+# they are matched exactly as the scanner matches them: a terminated string
+# may span lines (without advancing the line count), an unterminated one ends
+# at the newline
+_PRESCAN_RE = re.compile(r'"[^"]*"|"[^"\n]*|//.+|[{}();]')
+_SKIP_RE = re.compile(r"(?:[ \t\n]+|//.+)*")
+_ELSE_RE = re.compile(r"else(?!\w)")
+
+
+def boundaries(source: str, count: int) -> Iterator[Tuple[int, int]]:
+    # NB: yields (offset, line) for up to count - 1 cuts, each the first safe
+    # top-level statement boundary past an even share of the source: just
+    # after a ";" or "}" outside any brace or paren, and not before an "else"
+    # that still belongs to the statement
+    if count < 2:
+        return
+    step = len(source) // count
+    target = step
+    depth, line, last, hidden = 0, 1, 0, 0
+    for m in _PRESCAN_RE.finditer(source):
+        text = m.group()
+        char = text[0]
+        if char == '"':
+            hidden += text.count("\n")
+            continue
+        if char == "/":
+            continue
+        if char in "{(":
+            depth += 1
+            continue
+        if char == ")":
+            depth -= 1
+            continue
+        if char == "}":
+            depth -= 1
+        if depth != 0 or m.end() < target:
+            continue
+
+        end = m.end()
+        if _ELSE_RE.match(source, _SKIP_RE.match(source, end).end()):
+            continue
+
+        line += source.count("\n", last, end) - hidden
+        last, hidden = end, 0
+        yield end, line
+
+        target = end + step
+        count -= 1
+        if count == 1:
+            return
+
+
+def split(source: str, count: int) -> List[Tuple[str, int]]:
+    chunks, start, line = [], 0, 1
+    for end, next_line in boundaries(source, count):
+        chunks.append((source[start:end], line))
+        start, line = end, next_line
+    chunks.append((source[start:], line))
+
+    return chunks
+
+
+def parse_chunk(chunk: Tuple[str, int]) -> Optional[List[Stmt]]:
+    source, line = chunk
+    session = lox.LoxSession(stderr=io.StringIO())
+    statements = session.parse(session.tokenize(source, line))
+
+    return None if session.had_error else statements
+
+
+# NB: None means some chunk reported an error; the caller then parses the whole
+# script again sequentially, so diagnostics come out exactly as they would have
+def parse_parallel(source: str, jobs: int) -> Optional[List[Stmt]]:
+    chunks = split(source, jobs * CHUNKS_PER_JOB)
+    if len(chunks) == 1:
+        return parse_chunk(chunks[0])
+
+    # NB: moving the trees between processes costs about as much as parsing
+    # them, and most of that is the cyclic GC rescanning nodes that can never
+    # form cycles, so it is paused on both sides
+    enabled = gc.isenabled()
+    gc.disable()
+    statements: List[Stmt] = []
+    try:
+        with ProcessPoolExecutor(jobs, initializer=gc.disable) as executor:
+            for chunk in executor.map(parse_chunk, chunks):
+                if chunk is None:
+                    executor.shutdown(cancel_futures=True)
+                    return None
+                statements.extend(chunk)
+    finally:
+        if enabled:
+            gc.enable()
+
+    return statements
@@ -1,77 +1,157 @@
+import gc
+from array import array
 from app import lox
 from app.error import ParseError
 from app.expr import Expr, Assign, Binary, Logical, Unary, Literal, Grouping, Variable
-from app.scanner import ValidToken, ValidTokenType
+from app.scanner import TokenBuffer, ValidToken, ValidTokenType
 from app.stmt import Stmt, If, Print, Block, Expression, Var, While
-from typing import List, Optional
+from typing import Optional, Sequence
+
+# NB: binding powers, loosest first. expression() and repl_expr() parse from
+# ASSIGNMENT and expr() (the parse command) from EQUALITY, and they build
+# exactly the trees the former recursive descent through one method per level
+# did.
+ASSIGNMENT, OR, AND, EQUALITY, COMPARISON, TERM, FACTOR, UNARY = range(8)
+
+# NB: the parser works on the raw type codes of TokenBuffer and only builds a
+# ValidToken for the tokens that end up in the tree or in an error message
+_CODES = {type_: type_.value for type_ in ValidTokenType}
+_EOF = ValidTokenType.EOF.value
+_SEMICOLON = ValidTokenType.SEMICOLON.value
+_PRINT = ValidTokenType.PRINT.value
+_EQUAL = ValidTokenType.EQUAL.value
+_IDENTIFIER = ValidTokenType.IDENTIFIER.value
+_LEFT_PAREN = ValidTokenType.LEFT_PAREN.value
+_LITERALS = frozenset(
+    type_.value
+    for type_ in (
+        ValidTokenType.TRUE,
+        ValidTokenType.FALSE,
+        ValidTokenType.NIL,
+        ValidTokenType.FLOAT,
+        ValidTokenType.INTEGER,
+        ValidTokenType.STRING,
+    )
+)
+_UNARY = frozenset((ValidTokenType.BANG.value, ValidTokenType.MINUS.value))
+_INFIX = {
+    ValidTokenType.EQUAL.value: ASSIGNMENT,
+    ValidTokenType.OR.value: OR,
+    ValidTokenType.AND.value: AND,
+    ValidTokenType.BANG_EQUAL.value: EQUALITY,
+    ValidTokenType.EQUAL_EQUAL.value: EQUALITY,
+    ValidTokenType.GREATER.value: COMPARISON,
+    ValidTokenType.GREATER_EQUAL.value: COMPARISON,
+    ValidTokenType.LESS.value: COMPARISON,
+    ValidTokenType.LESS_EQUAL.value: COMPARISON,
+    ValidTokenType.MINUS.value: TERM,
+    ValidTokenType.PLUS.value: TERM,
+    ValidTokenType.SLASH.value: FACTOR,
+    ValidTokenType.STAR.value: FACTOR,
+}
 
 
 class Parser:
-    def __init__(self, tokens: List[ValidToken]):
+    def __init__(
+        self, tokens: Sequence[ValidToken], reporter: Optional["lox.LoxSession"] = None
+    ):
         self.tokens = tokens
+        if isinstance(tokens, TokenBuffer):
+            self.types = tokens.types
+        else:
+            self.types = array("B", (token.type.value for token in tokens))
+        self.reporter = reporter if reporter is not None else lox.Lox.session
         self.cursor = 0
         self.statements = []
 
     def error(self, token: ValidToken, message: str) -> ParseError:
-        lox.Lox.error2(token, message)
+        self.reporter.error2(token, message)
 
         return ParseError()
 
     def synchronize(self) -> None:
         _ = self.advance()
 
-        while not self.is_at_end():
-            if self.previous().type == ValidTokenType.SEMICOLON:
+        types = self.types
+        while types[self.cursor] != _EOF:
+            if types[self.cursor - 1] == _SEMICOLON:
+                return
+            if types[self.cursor] == _PRINT:
                 return
-            match self.peek().type:
-                case ValidTokenType.PRINT:
-                    return
 
-            _ = self.advance()
+            self.cursor += 1
 
     def peek(self) -> ValidToken:
         return self.tokens[self.cursor]
 
     def is_at_end(self) -> bool:
-        return self.peek().type == ValidTokenType.EOF
+        return self.types[self.cursor] == _EOF
 
     def previous(self) -> ValidToken:
         return self.tokens[self.cursor - 1]
 
     def advance(self) -> ValidToken:
-        if not self.is_at_end():
+        if self.types[self.cursor] != _EOF:
             self.cursor += 1
         return self.previous()
 
     def check(self, type_: ValidTokenType) -> bool:
-        if self.is_at_end():
-            return False
-        return self.peek().type == type_
+        code = self.types[self.cursor]
+        return code == _CODES[type_] and code != _EOF
 
     def match(self, *types: ValidTokenType) -> bool:
+        code = self.types[self.cursor]
+        if code == _EOF:
+            return False
         for type_ in types:
-            if self.check(type_):
-                _ = self.advance()
+            if code == _CODES[type_]:
+                self.cursor += 1
                 return True
 
         return False
 
     def consume(self, type_: ValidTokenType, message: str) -> ValidToken:
         if self.check(type_):
-            return self.advance()
+            self.cursor += 1
+            return self.previous()
 
         raise self.error(self.peek(), message)
 
+    # NB: consume() for punctuation nobody keeps, without building its token
+    def expect(self, type_: ValidTokenType, message: str) -> None:
+        if not self.check(type_):
+            raise self.error(self.peek(), message)
+        self.cursor += 1
+
     def expr(self) -> Optional[Expr]:
         try:
-            return self.equality()
+            return self.precedence(EQUALITY)
+        except ParseError:
+            return None
+
+    # NB: a whole REPL input; unlike expr() it starts at assignment and has to
+    # consume everything up to EOF
+    def repl_expr(self) -> Optional[Expr]:
+        try:
+            expr = self.expression()
+            if not self.is_at_end():
+                raise self.error(self.peek(), "Expect end of expression.")
+            return expr
         except ParseError:
             return None
 
     def parse(self) -> Optional[Stmt]:
-        statements = []
-        while not self.is_at_end():
-            statements.append(self.declaration())
+        # NB: the tree has no cycles, so collections while it grows only rescan
+        # the nodes built so far
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            statements = []
+            while not self.is_at_end():
+                statements.append(self.declaration())
+        finally:
+            if enabled:
+                gc.enable()
 
         return statements
 
@@ -91,7 +171,7 @@ class Parser:
         if self.match(ValidTokenType.EQUAL):
             initializer = self.expression()
 
-        self.consume(ValidTokenType.SEMICOLON, "Expect ';' after variable declaration.")
+        self.expect(ValidTokenType.SEMICOLON, "Expect ';' after variable declaration.")
         return Var(name, initializer)
 
     def statement(self) -> Stmt:
@@ -109,17 +189,18 @@ class Parser:
             return self.expression_statement()
 
     def block(self) -> Block:
+        line = self.previous().line
         statements = []
         while not self.check(ValidTokenType.RIGHT_BRACE) and not self.is_at_end():
             statements.append(self.declaration())
 
-        self.consume(ValidTokenType.RIGHT_BRACE, "Expect '}' after block.")
-        return Block(statements)
+        self.expect(ValidTokenType.RIGHT_BRACE, "Expect '}' after block.")
+        return Block(statements, line)
 
     def if_statement(self) -> Stmt:
-        self.consume(ValidTokenType.LEFT_PAREN, "Expect '(' after 'if'.")
+        self.expect(ValidTokenType.LEFT_PAREN, "Expect '(' after 'if'.")
         condition = self.expression()
-        self.consume(ValidTokenType.RIGHT_PAREN, "Expect ')' after if condition.")
+        self.expect(ValidTokenType.RIGHT_PAREN, "Expect ')' after if condition.")
 
         then_branch = self.statement()
         else_branch = self.statement() if self.match(ValidTokenType.ELSE) else None
@@ -128,20 +209,21 @@ class Parser:
 
     def print_statement(self) -> Stmt:
         value = self.expression()
-        self.consume(ValidTokenType.SEMICOLON, "Expect ';' after value.")
+        self.expect(ValidTokenType.SEMICOLON, "Expect ';' after value.")
 
         return Print(value)
 
     def while_statement(self) -> Stmt:
-        self.consume(ValidTokenType.LEFT_PAREN, "Expect '(' after 'while'.")
+        self.expect(ValidTokenType.LEFT_PAREN, "Expect '(' after 'while'.")
         condition = self.expression()
-        self.consume(ValidTokenType.RIGHT_PAREN, "Expect ')' after condition.")
+        self.expect(ValidTokenType.RIGHT_PAREN, "Expect ')' after condition.")
         body = self.statement()
 
         return While(condition, body)
 
     def for_statement(self) -> Stmt:
-        self.consume(ValidTokenType.LEFT_PAREN, "Expect '(' after 'for'.")
+        line = self.previous().line
+        self.expect(ValidTokenType.LEFT_PAREN, "Expect '(' after 'for'.")
         if self.match(ValidTokenType.SEMICOLON):
             initializer = None
         elif self.match(ValidTokenType.VAR):
@@ -152,150 +234,86 @@ class Parser:
         condition = None
         if not self.check(ValidTokenType.SEMICOLON):
             condition = self.expression()
-        self.consume(ValidTokenType.SEMICOLON, "Expect ';' after loop condition.")
+        self.expect(ValidTokenType.SEMICOLON, "Expect ';' after loop condition.")
 
         increment = None
         if not self.check(ValidTokenType.RIGHT_PAREN):
             increment = self.expression()
-        self.consume(ValidTokenType.RIGHT_PAREN, "Expect ')' after for clauses.")
+        self.expect(ValidTokenType.RIGHT_PAREN, "Expect ')' after for clauses.")
 
         body = self.statement()
         if increment:
-            body = Block([body, Expression(increment)])
+            body = Block([body, Expression(increment)], line)
 
         if condition is None:
-            condition = Literal(ValidToken(ValidTokenType.TRUE, "true", None, 1))
+            condition = Literal(ValidToken(ValidTokenType.TRUE, "true", None, line))
         body = While(condition, body)
 
         if initializer is not None:
-            body = Block([initializer, body])
+            body = Block([initializer, body], line)
 
         return body
 
     def expression_statement(self) -> Stmt:
         expr = self.expression()
-        self.consume(ValidTokenType.SEMICOLON, "Expect ';' after expression.")
+        self.expect(ValidTokenType.SEMICOLON, "Expect ';' after expression.")
 
         return Expression(expr)
 
     def expression(self) -> Expr:
-        return self.assignment()
-
-    def assignment(self) -> Expr:
-        expr = self.or_()
-
-        if self.match(ValidTokenType.EQUAL):
-            equals = self.previous()
-            value = self.assignment()
-
-            if isinstance(expr, Variable):
-                name = expr.name
-                return Assign(name, value)
-
-            self.error(equals, "Invalid assignment target.")
-
-        return expr
-
-    def or_(self) -> Expr:
-        expr = self.and_()
-
-        while self.match(ValidTokenType.OR):
-            operator = self.previous()
-            right = self.and_()
-            expr = Logical(expr, operator, right)
-
-        return expr
-
-    def and_(self) -> Expr:
-        expr = self.equality()
-
-        while self.match(ValidTokenType.AND):
-            operator = self.previous()
-            right = self.and_()
-            expr = Logical(expr, operator, right)
-
-        return expr
-
-    def equality(self) -> Expr:
-        expr = self.comparison()
-
-        while self.match(
-            ValidTokenType.BANG_EQUAL,
-            ValidTokenType.EQUAL_EQUAL,
-        ):
-            operator = self.previous()
-            right = self.comparison()
-            expr = Binary(expr, operator, right)
-
-        return expr
-
-    def comparison(self) -> Expr:
-        expr = self.term()
-
-        while self.match(
-            ValidTokenType.GREATER,
-            ValidTokenType.GREATER_EQUAL,
-            ValidTokenType.LESS,
-            ValidTokenType.LESS_EQUAL,
-        ):
-            operator = self.previous()
-            right = self.term()
-            expr = Binary(expr, operator, right)
-
-        return expr
-
-    def term(self) -> Expr:
-        expr = self.factor()
-
-        while self.match(
-            ValidTokenType.MINUS,
-            ValidTokenType.PLUS,
-        ):
-            operator = self.previous()
-            right = self.factor()
-            expr = Binary(expr, operator, right)
-
-        return expr
-
-    def factor(self) -> Expr:
-        expr = self.unary()
-
-        while self.match(
-            ValidTokenType.SLASH,
-            ValidTokenType.STAR,
-        ):
-            operator = self.previous()
-            right = self.unary()
-            expr = Binary(expr, operator, right)
-
-        return expr
-
-    def unary(self) -> Expr:
-        if self.match(
-            ValidTokenType.BANG,
-            ValidTokenType.MINUS,
-        ):
+        return self.precedence(ASSIGNMENT)
+
+    # NB: precedence climbing: parse a prefix, then keep folding in infix
+    # operators that bind at least as tightly as the level asked for
+    def precedence(self, minimum: int) -> Expr:
+        types = self.types
+        expr = self.prefix()
+
+        while True:
+            code = types[self.cursor]
+            power = _INFIX.get(code)
+            if power is None or power < minimum:
+                return expr
+            self.cursor += 1
             operator = self.previous()
-            right = self.unary()
-            return Unary(operator, right)
 
-        return self.primary()
-
-    def primary(self) -> Expr:
-        if self.match(
-            ValidTokenType.TRUE,
-            ValidTokenType.FALSE,
-            ValidTokenType.NIL,
-            ValidTokenType.FLOAT,
-            ValidTokenType.INTEGER,
-            ValidTokenType.STRING,
-        ):
+            if power >= EQUALITY:
+                expr = Binary(expr, operator, self.precedence(power + 1))
+            elif power == AND:
+                # NB: "and" nests to the right, "or" to the left
+                expr = Logical(expr, operator, self.precedence(AND))
+            elif power == OR:
+                expr = Logical(expr, operator, self.precedence(AND))
+            else:
+                return self.assignment(expr, operator)
+
+    def assignment(self, target: Expr, equals: ValidToken) -> Expr:
+        value = self.precedence(ASSIGNMENT)
+
+        if isinstance(target, Variable):
+            name = target.name
+            return Assign(name, value)
+
+        self.error(equals, "Invalid assignment target.")
+        return target
+
+    def prefix(self) -> Expr:
+        code = self.types[self.cursor]
+        if code in _LITERALS:
+            self.cursor += 1
             return Literal(self.previous())
-        if self.match(ValidTokenType.IDENTIFIER):
+        if code == _IDENTIFIER:
+            self.cursor += 1
             return Variable(self.previous())
-        if self.match(ValidTokenType.LEFT_PAREN):
+        if code in _UNARY:
+            self.cursor += 1
+            operator = self.previous()
+            right = self.prefix()
+            return Unary(operator, right)
+        if code == _LEFT_PAREN:
+            self.cursor += 1
             expr = self.expression()
-            self.consume(ValidTokenType.RIGHT_PAREN, "Expect ')' after for clauses.")
+            self.expect(ValidTokenType.RIGHT_PAREN, "Expect ')' after for clauses.")
             return Grouping(expr)
 
         raise self.error(self.peek(), "Expect expression.")
@@ -0,0 +1,191 @@
+import json
+import marshal
+from time import perf_counter
+from typing import Callable, Dict, Optional, Tuple, Union
+
+from app import lox
+from app.expr import (
+    Assign,
+    Binary,
+    Expr,
+    ExprVisitor,
+    Grouping,
+    Literal,
+    Logical,
+    Unary,
+    Variable,
+)
+from app.interpreter import Interpreter
+from app.output import Output
+from app.stmt import Block, Expression, If, Print, Stmt, StmtVisitor, Var, While
+
+Node = Union[Expr, Stmt]
+
+
+class Stats:
+    __slots__ = ("count", "cumulative", "own")
+
+    def __init__(self):
+        self.count = 0
+        self.cumulative = 0.0
+        self.own = 0.0
+
+    def add(self, cumulative: float, own: float) -> None:
+        self.count += 1
+        self.cumulative += cumulative
+        self.own += own
+
+    def to_dict(self) -> dict:
+        return {"count": self.count, "cumulative": self.cumulative, "self": self.own}
+
+
+class Profile:
+    def __init__(self):
+        self.lines: Dict[int, Stats] = dict()
+        self.nodes: Dict[str, Stats] = dict()
+        # NB: (line, node type) pairs play the part of functions for pstats
+        self.sites: Dict[Tuple[int, str], Stats] = dict()
+        self.loops: Dict[int, int] = dict()
+
+    def record(self, line: int, kind: str, cumulative: float, own: float) -> None:
+        keys = ((self.lines, line), (self.nodes, kind), (self.sites, (line, kind)))
+        for table, key in keys:
+            stats = table.get(key)
+            if stats is None:
+                stats = table[key] = Stats()
+            stats.add(cumulative, own)
+
+    def count_loop(self, line: int, iterations: int) -> None:
+        self.loops[line] = self.loops.get(line, 0) + iterations
+
+    def report(self, top: int = 10) -> str:
+        rows = ["== hottest lines ==", f"{'line':>6} {'visits':>10} {'self (ms)':>12}"]
+        hottest = sorted(self.lines.items(), key=lambda item: -item[1].own)[:top]
+        for line, stats in hottest:
+            rows.append(f"{line:>6} {stats.count:>10} {stats.own * 1e3:>12.3f}")
+
+        rows += [
+            "== node types ==",
+            f"{'node':<12} {'visits':>10} {'cumulative (ms)':>16} {'self (ms)':>12}",
+        ]
+        for kind, stats in sorted(self.nodes.items(), key=lambda item: -item[1].own):
+            rows.append(
+                f"{kind:<12} {stats.count:>10} "
+                f"{stats.cumulative * 1e3:>16.3f} {stats.own * 1e3:>12.3f}"
+            )
+
+        if self.loops:
+            rows += ["== while loops ==", f"{'line':>6} {'iterations':>10}"]
+            for line, iterations in sorted(self.loops.items()):
+                rows.append(f"{line:>6} {iterations:>10}")
+
+        return "\n".join(rows)
+
+    def to_json(self) -> dict:
+        return {
+            "lines": {str(line): stats.to_dict() for line, stats in self.lines.items()},
+            "nodes": {kind: stats.to_dict() for kind, stats in self.nodes.items()},
+            "loops": {str(line): iterations for line, iterations in self.loops.items()},
+        }
+
+    def dump(self, path: str, filename: str) -> None:
+        if path.endswith(".json"):
+            with open(path, "w") as file:
+                json.dump(self.to_json(), file, indent=2)
+            return
+
+        # NB: the marshalled layout pstats.Stats loads: (file, line, name) ->
+        # (primitive calls, calls, self time, cumulative time, callers)
+        stats = {
+            (filename, line, kind): (s.count, s.count, s.own, s.cumulative, {})
+            for (line, kind), s in self.sites.items()
+        }
+        with open(path, "wb") as file:
+            marshal.dump(stats, file)
+
+
+class LineFinder(ExprVisitor, StmtVisitor):
+    def line(self, node: Node) -> int:
+        return node.accept(self)
+
+    def visit_expression_stmt(self, stmt: Expression) -> int:
+        return self.line(stmt.expression)
+
+    def visit_print_stmt(self, stmt: Print) -> int:
+        return self.line(stmt.expression)
+
+    def visit_var_stmt(self, stmt: Var) -> int:
+        return stmt.name.line
+
+    def visit_block_stmt(self, stmt: Block) -> int:
+        return self.line(stmt.statements[0]) if stmt.statements else stmt.line
+
+    def visit_if_stmt(self, stmt: If) -> int:
+        return self.line(stmt.condition)
+
+    def visit_while_stmt(self, stmt: While) -> int:
+        return self.line(stmt.condition)
+
+    def visit_assign_expr(self, expr: Assign) -> int:
+        return expr.name.line
+
+    def visit_binary_expr(self, expr: Binary) -> int:
+        return expr.line
+
+    def visit_grouping_expr(self, expr: Grouping) -> int:
+        return self.line(expr.expression)
+
+    def visit_literal_expr(self, expr: Literal) -> int:
+        return expr.value.line
+
+    def visit_logical_expr(self, expr: Logical) -> int:
+        return expr.line
+
+    def visit_unary_expr(self, expr: Unary) -> int:
+        return expr.line
+
+    def visit_variable_expr(self, expr: Variable) -> int:
+        return expr.name.line
+
+
+# NB: profiling lives in a subclass so the plain interpreter pays nothing for
+# it when it is switched off
+class ProfilingInterpreter(Interpreter):
+    fuse_loops = False
+
+    def __init__(
+        self,
+        output: Optional[Output] = None,
+        reporter: Optional["lox.LoxSession"] = None,
+    ):
+        super().__init__(output, reporter)
+        self.profile = Profile()
+        self._lines = LineFinder()
+        # NB: time spent in the children of the node currently being visited
+        self._children = 0.0
+
+    def measure(self, node: Node, visit: Callable[[Node], object]) -> object:
+        outer, self._children = self._children, 0.0
+        start = perf_counter()
+        try:
+            return visit(node)
+        finally:
+            elapsed = perf_counter() - start
+            line, kind = self._lines.line(node), type(node).__name__
+            self.profile.record(line, kind, elapsed, elapsed - self._children)
+            self._children = outer + elapsed
+
+    def execute(self, stmt: Stmt) -> None:
+        self.measure(stmt, super().execute)
+
+    def evaluate(self, expr: Expr) -> object:
+        return self.measure(expr, super().evaluate)
+
+    def visit_while_stmt(self, stmt: While) -> None:
+        iterations = 0
+        try:
+            while self.is_truthy(self.evaluate(stmt.condition)):
+                iterations += 1
+                self.execute(stmt.body)
+        finally:
+            self.profile.count_loop(self._lines.line(stmt), iterations)
@@ -0,0 +1,167 @@
+import sys
+import traceback
+from time import perf_counter
+from typing import List, Optional, TextIO
+
+from app.lox import LoxSession
+from app.scanner import Scanner, ValidTokenType
+
+PROMPT = "> "
+CONTINUATION = "... "
+
+_OPENERS = {ValidTokenType.LEFT_BRACE: 1, ValidTokenType.LEFT_PAREN: 1}
+_CLOSERS = {ValidTokenType.RIGHT_BRACE: -1, ValidTokenType.RIGHT_PAREN: -1}
+# NB: input ending in one of these cannot be complete yet
+_DANGLING = (
+    ValidTokenType.PLUS,
+    ValidTokenType.MINUS,
+    ValidTokenType.STAR,
+    ValidTokenType.SLASH,
+    ValidTokenType.BANG,
+    ValidTokenType.BANG_EQUAL,
+    ValidTokenType.EQUAL,
+    ValidTokenType.EQUAL_EQUAL,
+    ValidTokenType.GREATER,
+    ValidTokenType.GREATER_EQUAL,
+    ValidTokenType.LESS,
+    ValidTokenType.LESS_EQUAL,
+    ValidTokenType.AND,
+    ValidTokenType.OR,
+    ValidTokenType.ELSE,
+)
+_STATEMENTS = (
+    ValidTokenType.PRINT,
+    ValidTokenType.VAR,
+    ValidTokenType.IF,
+    ValidTokenType.WHILE,
+    ValidTokenType.FOR,
+    ValidTokenType.LEFT_BRACE,
+)
+
+
+class _Probe:
+    # NB: stands in for the session while peeking at unfinished input, so
+    # nothing is reported for text that is still being typed
+    def __init__(self):
+        self.unterminated = False
+
+    def error1(self, line: int, message: str) -> None:
+        if message == "Unterminated string.":
+            self.unterminated = True
+
+
+def needs_more(source: str) -> bool:
+    probe = _Probe()
+    tokens = Scanner(source, probe).scan()
+    if probe.unterminated:
+        return True
+
+    depth = 0
+    for token in tokens:
+        depth += _OPENERS.get(token.type, 0) + _CLOSERS.get(token.type, 0)
+
+    if depth > 0:
+        return True
+    return len(tokens) > 1 and tokens[len(tokens) - 2].type in _DANGLING
+
+
+# NB: a bare expression without its ";" is evaluated and its value echoed
+def is_expression(source: str) -> bool:
+    tokens = Scanner(source, _Probe()).scan()
+    if len(tokens) < 2 or tokens[0].type in _STATEMENTS:
+        return False
+
+    last = tokens[len(tokens) - 2].type
+    return last not in (ValidTokenType.SEMICOLON, ValidTokenType.RIGHT_BRACE)
+
+
+class Repl:
+    def __init__(
+        self,
+        session: LoxSession,
+        stdin: Optional[TextIO] = None,
+        stderr: Optional[TextIO] = None,
+        timing: bool = False,
+    ):
+        self.session = session
+        self.stdin = stdin if stdin is not None else sys.stdin
+        self.stderr = stderr if stderr is not None else sys.stderr
+        self.timing = timing
+
+    def read_line(self, prompt: str) -> Optional[str]:
+        if self.stdin.isatty():
+            try:
+                return input(prompt)
+            except EOFError:
+                return None
+
+        line = self.stdin.readline()
+        return line.rstrip("\n") if line else None
+
+    def read(self) -> Optional[str]:
+        buffer: List[str] = []
+        prompt = PROMPT
+        while True:
+            line = self.read_line(prompt)
+            if line is None:
+                return "\n".join(buffer) if buffer else None
+
+            # NB: an empty line ends a continuation whatever state it is in
+            if buffer and not line.strip():
+                return "\n".join(buffer)
+
+            buffer.append(line)
+            source = "\n".join(buffer)
+            if not needs_more(source):
+                return source
+            prompt = CONTINUATION
+
+    def command(self, source: str) -> bool:
+        match source.strip():
+            case ":quit":
+                return False
+            case ":time":
+                self.timing = not self.timing
+                print(f"timing {'on' if self.timing else 'off'}", file=self.stderr)
+            case _:
+                print(f"Unknown command: {source.strip()}", file=self.stderr)
+
+        return True
+
+    def execute(self, source: str) -> None:
+        start = perf_counter()
+        try:
+            if is_expression(source):
+                self.session.evaluate(source, repl=True)
+            else:
+                self.session.run(source)
+        except KeyboardInterrupt:
+            print("Interrupted.", file=self.stderr)
+        except Exception:
+            # NB: a crash in one input must not take the session down with it
+            error = traceback.format_exception_only(*sys.exc_info()[:2])
+            print("".join(error), end="", file=self.stderr)
+        finally:
+            self.session.interpreter.output.flush()
+
+        if self.timing:
+            print(f"[{(perf_counter() - start) * 1e3:.3f} ms]", file=self.stderr)
+
+    def run(self) -> None:
+        while True:
+            try:
+                source = self.read()
+            except KeyboardInterrupt:
+                print(file=self.stderr)
+                continue
+
+            if source is None:
+                return
+            if not source.strip():
+                continue
+            if source.lstrip().startswith(":"):
+                if not self.command(source):
+                    return
+                continue
+
+            self.execute(source)
@@ -0,0 +1,109 @@
+from typing import Dict, List
+
+from app.expr import (
+    Assign,
+    Binary,
+    Expr,
+    ExprVisitor,
+    Grouping,
+    Literal,
+    Logical,
+    Unary,
+    Variable,
+)
+from app.loops import counted_loop
+from app.scanner import ValidToken
+from app.stmt import Block, Expression, If, Print, Stmt, StmtVisitor, Var, While
+
+
+class Resolver(ExprVisitor, StmtVisitor):
+    def __init__(self):
+        # NB: the global scope outlives a single resolve() call so that
+        # slots stay in step with the interpreter's global environment
+        self._scopes: List[Dict[str, int]] = [dict()]
+
+    def resolve(self, statements: List[Stmt]) -> None:
+        for statement in statements:
+            self.resolve_stmt(statement)
+
+    def resolve_stmt(self, stmt: Stmt) -> None:
+        stmt.accept(self)
+
+    def resolve_expr(self, expr: Expr) -> None:
+        expr.accept(self)
+
+    def declare(self, name: ValidToken) -> int:
+        scope = self._scopes[-1]
+        if name.lexeme not in scope:
+            scope[name.lexeme] = len(scope)
+
+        return scope[name.lexeme]
+
+    def resolve_local(self, expr: Variable | Assign, name: ValidToken) -> None:
+        for depth, scope in enumerate(reversed(self._scopes)):
+            if name.lexeme in scope:
+                expr.depth, expr.slot = depth, scope[name.lexeme]
+                return
+        # NB: unresolved names are left for the interpreter to report as
+        # undefined variables when (and if) they are evaluated
+
+    def visit_block_stmt(self, stmt: Block) -> None:
+        # NB: a block that declares nothing gets no scope here and so no
+        # environment at runtime; depths only count blocks that do declare
+        if not any(isinstance(statement, Var) for statement in stmt.statements):
+            stmt.size = 0
+            self.resolve(stmt.statements)
+            return
+
+        self._scopes.append(dict())
+        try:
+            self.resolve(stmt.statements)
+            stmt.size = len(self._scopes[-1])
+        finally:
+            self._scopes.pop()
+        stmt.loop = counted_loop(stmt)
+
+    def visit_expression_stmt(self, stmt: Expression) -> None:
+        self.resolve_expr(stmt.expression)
+
+    def visit_if_stmt(self, stmt: If) -> None:
+        self.resolve_expr(stmt.condition)
+        self.resolve_stmt(stmt.then_branch)
+        if stmt.else_branch is not None:
+            self.resolve_stmt(stmt.else_branch)
+
+    def visit_print_stmt(self, stmt: Print) -> None:
+        self.resolve_expr(stmt.expression)
+
+    def visit_var_stmt(self, stmt: Var) -> None:
+        if stmt.initializer is not None:
+            self.resolve_expr(stmt.initializer)
+        stmt.slot = self.declare(stmt.name)
+
+    def visit_while_stmt(self, stmt: While) -> None:
+        self.resolve_expr(stmt.condition)
+        self.resolve_stmt(stmt.body)
+
+    def visit_assign_expr(self, expr: Assign) -> None:
+        self.resolve_expr(expr.value)
+        self.resolve_local(expr, expr.name)
+
+    def visit_binary_expr(self, expr: Binary) -> None:
+        self.resolve_expr(expr.left)
+        self.resolve_expr(expr.right)
+
+    def visit_grouping_expr(self, expr: Grouping) -> None:
+        self.resolve_expr(expr.expression)
+
+    def visit_literal_expr(self, expr: Literal) -> None:
+        return None
+
+    def visit_logical_expr(self, expr: Logical) -> None:
+        self.resolve_expr(expr.left)
+        self.resolve_expr(expr.right)
+
+    def visit_unary_expr(self, expr: Unary) -> None:
+        self.resolve_expr(expr.right)
+
+    def visit_variable_expr(self, expr: Variable) -> None:
+        self.resolve_local(expr, expr.name)
@@ -1,7 +1,15 @@
 import re
+from array import array
+from collections.abc import Sequence
 from enum import Enum, auto
-from typing import List
-from app import lox
+from functools import partial
+from sys import intern
+from typing import TYPE_CHECKING, Iterator, Optional, TextIO, Tuple
+
+# NB: app.lox imports this module, and the AST, cache and batch modules reach
+# it first, so lox is only imported once a scanner needs the default session
+if TYPE_CHECKING:
+    from app import lox
 
 
 class ValidTokenType(Enum):
@@ -52,18 +60,9 @@ class ValidTokenType(Enum):
     EOF = auto()
 
 
-class WhiteTokenType(Enum):
-    NEWLINE = auto()
-    WHITESPACE = auto()
-    COMMENT = auto()
-
-
-class ErrorTokenType(Enum):
-    UNEXP_CHAR = auto()
-    UNTERM_STR = auto()
-
-
 class ValidToken:
+    __slots__ = ("type", "lexeme", "literal", "line")
+
     def __init__(self, type_: ValidTokenType, lexeme: str, literal: str, line: int):
         self.type = type_
         self.lexeme = lexeme
@@ -80,168 +79,214 @@ class ValidToken:
         return f"{name} {self.lexeme} {literal}"
 
 
-class WhiteToken:
-    def __init__(self, type_: WhiteTokenType, lexeme: str, line: int):
-        self.type = type_
-        self.lexeme = lexeme
-        self.line = line
+_TYPES = {type_.value: type_ for type_ in ValidTokenType}
 
+_KEYWORDS = {
+    keyword: getattr(ValidTokenType, keyword.upper())
+    for keyword in [
+        "and",
+        "class",
+        "else",
+        "false",
+        "fun",
+        "for",
+        "if",
+        "nil",
+        "or",
+        "print",
+        "return",
+        "super",
+        "this",
+        "true",
+        "var",
+        "while",
+    ]
+}
 
-class ErrorToken:
-    def __init__(self, type_: ErrorTokenType, lexeme: str, error: str, line):
-        self.type = type_
-        self.lexeme = lexeme
-        self.error = error
-        self.line = line
+# NB: Alternatives are tried left to right at each position, so the order
+# below mirrors the precedence of the cases in the original scanner.
+_RULES = [
+    ("LEFT_PAREN", r"\("),
+    ("RIGHT_PAREN", r"\)"),
+    ("LEFT_BRACE", r"{"),
+    ("RIGHT_BRACE", r"}"),
+    ("COMMA", r","),
+    ("DOT", r"\."),
+    ("MINUS", r"-"),
+    ("PLUS", r"\+"),
+    ("SEMICOLON", r";"),
+    ("STAR", r"\*"),
+    ("BANG_EQUAL", r"!="),
+    ("BANG", r"!"),
+    ("EQUAL_EQUAL", r"=="),
+    ("EQUAL", r"="),
+    ("GREATER_EQUAL", r">="),
+    ("GREATER", r">"),
+    ("LESS_EQUAL", r"<="),
+    ("LESS", r"<"),
+    ("STRING", r"\"[^\"]*\""),
+    ("NUMBER", r"\d+(?:\.?\d*)?"),
+    ("IDENTIFIER", r"[A-z_][\w]*"),
+    ("NEWLINE", r"[\n]+"),
+    ("WHITESPACE", r"[ \t]+"),
+    ("COMMENT", r"//.+"),
+    ("SLASH", r"/"),
+    ("UNTERM_STR", r"\"[^\"\n]*"),
+    ("UNEXP_CHAR", r"[\s\S]"),
+]
 
-    def __str__(self):
-        return f"[line {self.line}] Error: {self.error}"
+_TOKEN_RE = re.compile("|".join(f"(?P<{name}>{pattern})" for name, pattern in _RULES))
+
+_SIMPLE = {
+    name: ValidTokenType[name]
+    for name, _ in _RULES
+    if name in ValidTokenType.__members__ and name != "IDENTIFIER"
+}
+
+
+CHUNK_SIZE = 1 << 16
+
+
+def _literal(type_: ValidTokenType, lexeme: str) -> Optional[str]:
+    if type_ is ValidTokenType.STRING:
+        # NB: every occurrence of the same literal shares a single str
+        return intern(lexeme[1:-1])
+    elif type_ is ValidTokenType.INTEGER:
+        # NB: The below is simply a workaround the accomodate the
+        # incoinsistent design choice made by the author of the
+        # lox language in the representation of integers between the parser and the evaluator
+        # REF: https://forum.codecrafters.io/t/mutually-contradictory-test-cases-for-ht8-vs-lv1/3475
+        return f"{lexeme}.0"
+    elif type_ is ValidTokenType.FLOAT:
+        # handle trailing zeros sensibly
+        literal = lexeme.rstrip("0")
+        return literal + "0" if literal.endswith(".") else literal
+    return None
+
+
+def _scan(
+    chunks: Iterator[str], reporter: "lox.LoxSession", line: int = 1
+) -> Iterator[Tuple[ValidTokenType, Optional[re.Match], int]]:
+    match = _TOKEN_RE.match
+    buffer, i, more = "", 0, True
+    while True:
+        end = len(buffer)
+        if i >= end and not more:
+            break
+
+        m = match(buffer, i) if i < end else None
+        # NB: A match touching the end of the buffer (or the lookahead needed
+        # to tell "/" from "//") may still grow, and an unterminated string
+        # may yet find its closing quote, so pull in the next chunk first.
+        if more and (m is None or m.end() + 1 >= end or m.lastgroup == "UNTERM_STR"):
+            chunk = next(chunks, "")
+            if chunk:
+                buffer, i = buffer[i:] + chunk, 0
+            else:
+                more = False
+            continue
+
+        kind = m.lastgroup
+        i = m.end()
+
+        if kind in _SIMPLE:
+            yield _SIMPLE[kind], m, line
+        elif kind == "IDENTIFIER":
+            yield _KEYWORDS.get(m.group(), ValidTokenType.IDENTIFIER), m, line
+        elif kind == "NUMBER":
+            if "." not in m.group():
+                yield ValidTokenType.INTEGER, m, line
+            else:
+                yield ValidTokenType.FLOAT, m, line
+        elif kind == "NEWLINE":
+            line += i - m.start()
+        elif kind == "UNTERM_STR":
+            reporter.error1(line, "Unterminated string.")
+        elif kind == "UNEXP_CHAR":
+            reporter.error1(line, f"Unexpected character: {m.group()}")
+
+    yield ValidTokenType.EOF, None, line
+
+
+# NB: Tokens are kept as parallel arrays of type codes, source offsets and line
+# numbers; the ValidToken handed out by indexing is rebuilt from the source.
+class TokenBuffer(Sequence[ValidToken]):
+    def __init__(self, source: str):
+        self.source = source
+        self.types = array("B")
+        self.starts = array("I")
+        self.ends = array("I")
+        self.lines = array("I")
+        self._cached: Tuple[int, Optional[ValidToken]] = (-1, None)
+
+    def append(self, type_: ValidTokenType, start: int, end: int, line: int) -> None:
+        self.types.append(type_.value)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.lines.append(line)
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __getitem__(self, index: int) -> ValidToken:
+        if index < 0:
+            index += len(self.types)
+        # NB: the parser peeks at the same position several times in a row
+        if self._cached[0] == index:
+            return self._cached[1]
+
+        type_ = _TYPES[self.types[index]]
+        lexeme = self.source[self.starts[index] : self.ends[index]]
+        token = ValidToken(type_, lexeme, _literal(type_, lexeme), self.lines[index])
+        self._cached = (index, token)
+
+        return token
+
+
+def _default_session() -> "lox.LoxSession":
+    from app import lox
+
+    return lox.Lox.session
 
 
 class Scanner:
-    def __init__(self, buffer: str):
+    # NB: line is where buffer starts when it is a slice of a larger script
+    def __init__(
+        self,
+        buffer: str,
+        reporter: Optional["lox.LoxSession"] = None,
+        line: int = 1,
+    ):
         self.buffer = buffer
-        self.tokens: List[ValidToken] = []
-        self._whites: List[WhiteToken] = []
-
-    def scan(self) -> List[ValidToken]:
-        i, line = 0, 1
-        while i < len(self.buffer):
-            buffer = self.buffer[i:]
-            match buffer:
-                case _ if (m := re.match(r"\(", buffer)):
-                    t = m.group()
-                    token = ValidToken(ValidTokenType.LEFT_PAREN, t, None, line)
-                case _ if (m := re.match(r"\)", buffer)):
-                    t = m.group()
-                    token = ValidToken(ValidTokenType.RIGHT_PAREN, t, None, line)
-                case _ if (m := re.match(r"{", buffer)):
-                    t = m.group()
-                    token = ValidToken(ValidTokenType.LEFT_BRACE, t, None, line)
-                case _ if (m := re.match(r"}", buffer)):
-                    t = m.group()
-                    token = ValidToken(ValidTokenType.RIGHT_BRACE, t, None, line)
-                case _ if (m := re.match(r",", buffer)):
-                    t = m.group()
-                    token = ValidToken(ValidTokenType.COMMA, t, None, line)
-                case _ if (m := re.match(r"\.", buffer)):
-                    t = m.group()
-                    token = ValidToken(ValidTokenType.DOT, t, None, line)
-                case _ if (m := re.match(r"-", buffer)):
-                    t = m.group()
-                    token = ValidToken(ValidTokenType.MINUS, t, None, line)
-                case _ if (m := re.match(r"\+", buffer)):
-                    t = m.group()
-                    token = ValidToken(ValidTokenType.PLUS, t, None, line)
-                case _ if (m := re.match(r";", buffer)):
-                    t = m.group()
-                    token = ValidToken(ValidTokenType.SEMICOLON, t, None, line)
-                case _ if (m := re.match(r"\*", buffer)):
-                    t = m.group()
-                    token = ValidToken(ValidTokenType.STAR, t, None, line)
-                case _ if buffer.startswith("!"):
-                    if len(buffer) >= 2 and buffer[1] == "=":
-                        token = ValidToken(ValidTokenType.BANG_EQUAL, "!=", None, line)
-                    else:
-                        token = ValidToken(ValidTokenType.BANG, "!", None, line)
-                case _ if buffer.startswith("="):
-                    if len(buffer) >= 2 and buffer[1] == "=":
-                        token = ValidToken(ValidTokenType.EQUAL_EQUAL, "==", None, line)
-                    else:
-                        token = ValidToken(ValidTokenType.EQUAL, "=", None, line)
-                case _ if buffer.startswith(">"):
-                    if len(buffer) >= 2 and buffer[1] == "=":
-                        token = ValidToken(
-                            ValidTokenType.GREATER_EQUAL, ">=", None, line
-                        )
-                    else:
-                        token = ValidToken(ValidTokenType.GREATER, ">", None, line)
-                case _ if buffer.startswith("<"):
-                    if len(buffer) >= 2 and buffer[1] == "=":
-                        token = ValidToken(ValidTokenType.LESS_EQUAL, "<=", None, line)
-                    else:
-                        token = ValidToken(ValidTokenType.LESS, "<", None, line)
-                case _ if (m := re.match(r"\"([^\"]*)\"", buffer)):
-                    # match strings
-                    t = m.group()
-                    token = ValidToken(ValidTokenType.STRING, t, m.group(1), line)
-                case _ if (m := re.match(r"\d+(\.?\d*)?", buffer)):
-                    # NB: The below is simply a workaround the accomodate the
-                    # incoinsistent design choice made by the author of the
-                    # lox language in the representation of integers between the parser and the evaluator
-                    # REF: https://forum.codecrafters.io/t/mutually-contradictory-test-cases-for-ht8-vs-lv1/3475
-                    t = m.group()
-                    if m.group(1) == "":
-                        token = ValidToken(
-                            ValidTokenType.INTEGER, t, f"{m.group(0)}.0", line
-                        )
-                    else:
-                        # match number literals
-                        # handle trailing zeros sensibly
-                        literal = re.sub(r"0+$", r"", t)
-                        literal = re.sub(r"\.$", r".0", literal)
-                        token = ValidToken(ValidTokenType.FLOAT, t, literal, line)
-                case _ if (m := re.match(r"[A-z_][\w]*", buffer)):
-                    # match keywords and identifiers
-                    t = m.group()
-                    if t in [
-                        "and",
-                        "class",
-                        "else",
-                        "false",
-                        "fun",
-                        "for",
-                        "if",
-                        "nil",
-                        "or",
-                        "print",
-                        "return",
-                        "super",
-                        "this",
-                        "true",
-                        "var",
-                        "while",
-                    ]:
-                        token = ValidToken(
-                            getattr(ValidTokenType, t.upper()), t, None, line
-                        )
-                    else:
-                        token = ValidToken(ValidTokenType.IDENTIFIER, t, None, line)
-                case _ if (m := re.match(r"[\n]+", buffer)):
-                    # match newline character(s)
-                    t = m.group()
-                    token = WhiteToken(WhiteTokenType.NEWLINE, t, line)
-                    line += len(t)
-                case _ if (m := re.match(r"[ \t]+", buffer)):
-                    # match contiguous tabs and spaces
-                    t = m.group()
-                    token = WhiteToken(WhiteTokenType.WHITESPACE, t, line)
-                case _ if buffer.startswith("/"):
-                    if m := re.match(r"//.+", buffer):
-                        # match comment
-                        t = m.group()
-                        token = WhiteToken(WhiteTokenType.COMMENT, t, line)
-                    else:
-                        token = ValidToken(ValidTokenType.SLASH, "/", None, line)
-                case _ if (m := re.match(r"\"[^\"\n]*", buffer)):
-                    # match unbalanced strings (error)
-                    t = m.group()
-                    lox.Lox.error1(line, "Unterminated string.")
-                    token = ErrorToken(
-                        ErrorTokenType.UNTERM_STR, t, "Unterminated string.", line
-                    )
-                case _:
-                    t = buffer[0]
-                    lox.Lox.error1(line, f"Unexpected character: {t}")
-                    token = ErrorToken(
-                        ErrorTokenType.UNEXP_CHAR, t, f"Unexpected character: {t}", line
-                    )
-
-            if token.type in ValidTokenType:
-                self.tokens.append(token)
-
-            i += len(token.lexeme)
-
-        self.tokens.append(ValidToken(ValidTokenType.EOF, "", None, line))
+        self.reporter = reporter if reporter is not None else _default_session()
+        self.line = line
+        self.tokens = TokenBuffer(buffer)
+
+    def scan(self) -> TokenBuffer:
+        append, end = self.tokens.append, len(self.buffer)
+        tokens = _scan(iter((self.buffer,)), self.reporter, self.line)
+        for type_, m, line in tokens:
+            if m is None:
+                append(type_, end, end, line)
+            else:
+                append(type_, m.start(), m.end(), line)
 
         return self.tokens
+
+
+class StreamScanner:
+    def __init__(
+        self,
+        stream: TextIO,
+        reporter: Optional["lox.LoxSession"] = None,
+        chunk_size: int = CHUNK_SIZE,
+    ):
+        self.stream = stream
+        self.reporter = reporter if reporter is not None else _default_session()
+        self.chunk_size = chunk_size
+
+    def __iter__(self) -> Iterator[ValidToken]:
+        chunks = iter(partial(self.stream.read, self.chunk_size), "")
+        for type_, m, line in _scan(chunks, self.reporter):
+            lexeme = m.group() if m is not None else ""
+            yield ValidToken(type_, lexeme, _literal(type_, lexeme), line)
@@ -22,11 +22,15 @@ class StmtVisitor(Protocol[T]):
 
 
 class Stmt(abc.ABC):
+    __slots__ = ()
+
     @abc.abstractmethod
     def accept(self, visitor: "StmtVisitor[T]") -> T: ...
 
 
 class Print(Stmt):
+    __slots__ = ("expression",)
+
     def __init__(self, expression: Expr):
         self.expression = expression
 
@@ -35,14 +39,24 @@ class Print(Stmt):
 
 
 class Block(Stmt):
-    def __init__(self, statements: list[Stmt]):
+    __slots__ = ("statements", "line", "size", "loop")
+
+    # NB: line is where the block starts, the "{" or the "for" it desugars;
+    # error reports only fall back to it when the block is empty
+    def __init__(self, statements: list[Stmt], line: int = 0):
         self.statements = statements
+        self.line = line
+        self.size = 0
+        # NB: set by the resolver when the block is a counted for-loop
+        self.loop = None
 
     def accept(self, visitor: StmtVisitor[T]) -> T:
         return visitor.visit_block_stmt(self)
 
 
 class If(Stmt):
+    __slots__ = ("condition", "then_branch", "else_branch")
+
     def __init__(self, condition: Expr, then_branch: Stmt, else_branch: Optional[Stmt]):
         self.condition = condition
         self.then_branch = then_branch
@@ -53,6 +67,8 @@ class If(Stmt):
 
 
 class Expression(Stmt):
+    __slots__ = ("expression",)
+
     def __init__(self, expression: Expr):
         self.expression = expression
 
@@ -61,15 +77,20 @@ class Expression(Stmt):
 
 
 class Var(Stmt):
+    __slots__ = ("name", "initializer", "slot")
+
     def __init__(self, name: ValidToken, initializer: Expr):
         self.name = name
         self.initializer = initializer
+        self.slot: Optional[int] = None
 
     def accept(self, visitor: StmtVisitor[T]) -> T:
         return visitor.visit_var_stmt(self)
 
 
 class While(Stmt):
+    __slots__ = ("condition", "body")
+
     def __init__(self, condition: Expr, body: Stmt):
         self.condition = condition
         self.body = body
@@ -0,0 +1,67 @@
+from typing import List, Union
+
+# NB: below this length plain str concatenation is cheaper than a rope
+ROPE_THRESHOLD = 1 << 8
+
+
+# NB: a Lox string built by concatenation. Ropes that grow one another share an
+# append-only list of parts, each remembering how many of the parts are its
+# own, so "s = s + x" appends in place instead of copying s every time. The
+# flat str is only built when the value is printed or compared.
+class Rope:
+    __slots__ = ("_parts", "_count", "_length", "_flat")
+
+    def __init__(self, parts: List[str], length: int):
+        self._parts = parts
+        self._count = len(parts)
+        self._length = length
+        self._flat = None
+
+    def concat(self, other: str) -> "Rope":
+        parts = self._parts
+        if self._count != len(parts):
+            # NB: another rope already grew this one; branch off a copy
+            parts = parts[: self._count]
+        parts.append(other)
+
+        return Rope(parts, self._length + len(other))
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __str__(self) -> str:
+        if self._flat is None:
+            self._flat = "".join(self._parts[: self._count])
+        return self._flat
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is Rope:
+            other = str(other)
+        if type(other) is not str:
+            return NotImplemented
+        return self._length == len(other) and str(self) == other
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+    def __repr__(self) -> str:
+        return f"Rope({str(self)!r})"
+
+
+LoxString = Union[str, Rope]
+STRINGS = (str, Rope)
+# NB: matched with type(), not isinstance(): bool subclasses int but is not a
+# Lox number
+NUMBERS = (int, float)
+
+
+def concat(a: LoxString, b: LoxString) -> LoxString:
+    if type(b) is Rope:
+        b = str(b)
+    if type(a) is Rope:
+        return a.concat(b)
+
+    length = len(a) + len(b)
+    if length < ROPE_THRESHOLD:
+        return a + b
+    return Rope([a, b], length)
@@ -0,0 +1,220 @@
+from typing import List, Optional
+
+from app import lox
+from app.bytecode import Chunk, OpCode, disassemble
+from app.compiler import Compiler
+from app.environment import UNDEFINED
+from app.error import RuntimeError_
+from app.expr import Expr
+from app.interpreter import Interpreter
+from app.output import Output
+from app.stmt import Stmt
+from app.strings import NUMBERS, STRINGS, concat
+
+
+(
+    CONSTANT,
+    NIL,
+    TRUE,
+    FALSE,
+    POP,
+    POP_N,
+    GET_LOCAL,
+    SET_LOCAL,
+    GET_GLOBAL,
+    SET_GLOBAL,
+    DEFINE_GLOBAL,
+    UNDEFINED_,
+    EQUAL,
+    NOT_EQUAL,
+    GREATER,
+    GREATER_EQUAL,
+    LESS,
+    LESS_EQUAL,
+    ADD,
+    SUBTRACT,
+    MULTIPLY,
+    DIVIDE,
+    NOT,
+    NEGATE,
+    PRINT,
+    JUMP,
+    POP_JUMP_IF_FALSE,
+    JUMP_IF_FALSE_OR_POP,
+    JUMP_IF_TRUE_OR_POP,
+    RETURN,
+) = (int(op) for op in OpCode)
+
+
+class VMInterpreter(Interpreter):
+    def __init__(
+        self,
+        output: Optional[Output] = None,
+        reporter: Optional["lox.LoxSession"] = None,
+        disassemble: bool = False,
+    ):
+        super().__init__(output, reporter)
+        self.disassemble = disassemble
+
+    def interpret_expr(self, expr: Expr) -> None:
+        chunk = Compiler(self).compile_expr(expr)
+        try:
+            value = self.run(chunk)
+            self.output.write_line(self.stringify(value))
+        except RuntimeError_ as error:
+            self.runtime_error(error)
+        finally:
+            self.output.flush()
+
+    def interpret(self, statements: List[Stmt]) -> None:
+        chunk = Compiler(self).compile(statements)
+        try:
+            self.run(chunk)
+        except RuntimeError_ as error:
+            self.runtime_error(error)
+        finally:
+            self.output.flush()
+
+    def undefined(self, chunk: Chunk, offset: int) -> RuntimeError_:
+        name = chunk.tokens[offset]
+        return RuntimeError_(name, f"Undefined variable '{name.lexeme}'.")
+
+    def run(self, chunk: Chunk) -> object:
+        if self.disassemble:
+            reporter = self.reporter if self.reporter is not None else lox.Lox.session
+            print(disassemble(chunk, "script"), file=reporter.stderr)
+
+        code, constants, tokens = chunk.code, chunk.constants, chunk.tokens
+        globals_ = self._environment.values
+        write_line = self.output.write_line
+        stack: List[object] = []
+        push, pop = stack.append, stack.pop
+        ip = 0
+
+        while True:
+            op = code[ip]
+            ip += 1
+
+            if op == GET_LOCAL:
+                push(stack[code[ip]])
+                ip += 1
+            elif op == CONSTANT:
+                push(constants[code[ip]])
+                ip += 1
+            elif op == POP_JUMP_IF_FALSE:
+                value = pop()
+                if value is None or value is False:
+                    ip = code[ip]
+                else:
+                    ip += 1
+            elif op == SET_LOCAL:
+                stack[code[ip]] = stack[-1]
+                ip += 1
+            elif op == POP:
+                pop()
+            elif op == JUMP:
+                ip = code[ip]
+            elif op == ADD:
+                b, a = pop(), pop()
+                if type(a) in NUMBERS and type(b) in NUMBERS:
+                    push(a + b)
+                elif type(a) in STRINGS and type(b) in STRINGS:
+                    push(concat(a, b))
+                else:
+                    self.check_number_operands(tokens[ip - 1], a, b)
+            elif op == LESS:
+                b, a = pop(), pop()
+                if type(a) not in NUMBERS or type(b) not in NUMBERS:
+                    self.check_number_operands(tokens[ip - 1], a, b)
+                push(a < b)
+            elif op == GET_GLOBAL:
+                slot = code[ip]
+                value = globals_[slot] if slot < len(globals_) else UNDEFINED
+                if value is UNDEFINED:
+                    raise self.undefined(chunk, ip - 1)
+                push(value)
+                ip += 1
+            elif op == SET_GLOBAL:
+                slot = code[ip]
+                if slot >= len(globals_) or globals_[slot] is UNDEFINED:
+                    raise self.undefined(chunk, ip - 1)
+                globals_[slot] = stack[-1]
+                ip += 1
+            elif op == SUBTRACT:
+                b, a = pop(), pop()
+                if type(a) not in NUMBERS or type(b) not in NUMBERS:
+                    self.check_number_operands(tokens[ip - 1], a, b)
+                push(a - b)
+            elif op == MULTIPLY:
+                b, a = pop(), pop()
+                if type(a) not in NUMBERS or type(b) not in NUMBERS:
+                    self.check_number_operands(tokens[ip - 1], a, b)
+                push(a * b)
+            elif op == DIVIDE:
+                b, a = pop(), pop()
+                if type(a) not in NUMBERS or type(b) not in NUMBERS:
+                    self.check_number_operands(tokens[ip - 1], a, b)
+                push(a / b)
+            elif op == LESS_EQUAL:
+                b, a = pop(), pop()
+                if type(a) not in NUMBERS or type(b) not in NUMBERS:
+                    self.check_number_operands(tokens[ip - 1], a, b)
+                push(a <= b)
+            elif op == GREATER:
+                b, a = pop(), pop()
+                if type(a) not in NUMBERS or type(b) not in NUMBERS:
+                    self.check_number_operands(tokens[ip - 1], a, b)
+                push(a > b)
+            elif op == GREATER_EQUAL:
+                b, a = pop(), pop()
+                if type(a) not in NUMBERS or type(b) not in NUMBERS:
+                    self.check_number_operands(tokens[ip - 1], a, b)
+                push(a >= b)
+            elif op == EQUAL:
+                b, a = pop(), pop()
+                push(self.is_equal(a, b))
+            elif op == NOT_EQUAL:
+                b, a = pop(), pop()
+                push(not self.is_equal(a, b))
+            elif op == PRINT:
+                write_line(self.stringify(pop()))
+            elif op == POP_N:
+                del stack[len(stack) - code[ip] :]
+                ip += 1
+            elif op == NIL:
+                push(None)
+            elif op == TRUE:
+                push(True)
+            elif op == FALSE:
+                push(False)
+            elif op == NOT:
+                push(not self.is_truthy(pop()))
+            elif op == NEGATE:
+                value = pop()
+                if type(value) not in NUMBERS:
+                    self.check_number_operand(tokens[ip - 1], value)
+                push(-value)
+            elif op == JUMP_IF_FALSE_OR_POP:
+                value = stack[-1]
+                if value is None or value is False:
+                    ip = code[ip]
+                else:
+                    pop()
+                    ip += 1
+            elif op == JUMP_IF_TRUE_OR_POP:
+                value = stack[-1]
+                if value is None or value is False:
+                    pop()
+                    ip += 1
+                else:
+                    ip = code[ip]
+            elif op == DEFINE_GLOBAL:
+                slot = code[ip]
+                if slot >= len(globals_):
+                    globals_.extend([UNDEFINED] * (slot + 1 - len(globals_)))
+                globals_[slot] = pop()
+                ip += 1
+            elif op == UNDEFINED_:
+                raise self.undefined(chunk, ip - 1)
+            elif op == RETURN:
+                return stack[-1] if stack else None
@@ -0,0 +1,87 @@
+"""Measure the memory held by a parsed program, in bytes per AST node.
+
+    python -m benchmarks.ast_memory [--size 4M]
+
+"object" is the previous layout (one object with a __dict__ per node, every
+operator a full ValidToken), rebuilt here from the current tree; "slots" is
+the tree the parser returns now, __slots__ nodes that keep an operator as its
+token type and line.
+"""
+
+import io
+import tracemalloc
+from argparse import ArgumentParser
+
+from app.lox import LoxSession
+from app.expr import Expr
+from app.stmt import Stmt
+from benchmarks.parser import make_program
+from benchmarks.scanner import parse_size
+
+
+class DictNode:
+    pass
+
+
+def node_slots(node) -> list[str]:
+    return [
+        name for cls in type(node).__mro__ for name in getattr(cls, "__slots__", ())
+    ]
+
+
+def to_dict_nodes(node):
+    if isinstance(node, list):
+        return [to_dict_nodes(child) for child in node]
+    if not isinstance(node, (Expr, Stmt)):
+        return node
+
+    copy = DictNode()
+    for name in node_slots(node):
+        if name == "op":
+            copy.operator = node.operator
+        elif name != "line":
+            setattr(copy, name, to_dict_nodes(getattr(node, name, None)))
+
+    return copy
+
+
+def count_nodes(node) -> int:
+    if isinstance(node, list):
+        return sum(map(count_nodes, node))
+    if not isinstance(node, (Expr, Stmt)):
+        return 0
+
+    return 1 + sum(count_nodes(getattr(node, name, None)) for name in node_slots(node))
+
+
+def measure(build) -> int:
+    tracemalloc.start()
+    tree = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tree
+    return size
+
+
+def main():
+    parser = ArgumentParser(description="AST memory benchmark")
+    parser.add_argument("--size", default="4M")
+    args = parser.parse_args()
+
+    session = LoxSession(stderr=io.StringIO())
+    tokens = session.tokenize(make_program(parse_size(args.size)))
+    statements = session.parse(tokens)
+    nodes = count_nodes(statements)
+    layouts = {
+        "object": lambda: to_dict_nodes(statements),
+        "slots": lambda: session.parse(tokens),
+    }
+
+    print(f"{'layout':>8} {'nodes':>10} {'bytes':>12} {'bytes/node':>11}")
+    for name, build in layouts.items():
+        size = measure(build)
+        print(f"{name:>8} {nodes:>10} {size:>12} {size / nodes:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# Frozen copy of the original slice-and-regex scanner, kept only as the
+# reference point for benchmarks/scanner.py.
+import re
+from typing import List
+from app import lox
+from app.scanner import ValidToken, ValidTokenType
+
+
+class _White:
+    def __init__(self, lexeme: str):
+        self.lexeme = lexeme
+
+
+class LegacyScanner:
+    def __init__(self, buffer: str):
+        self.buffer = buffer
+        self.tokens: List[ValidToken] = []
+
+    def scan(self) -> List[ValidToken]:
+        i, line = 0, 1
+        while i < len(self.buffer):
+            buffer = self.buffer[i:]
+            match buffer:
+                case _ if (m := re.match(r"\(", buffer)):
+                    t = m.group()
+                    token = ValidToken(ValidTokenType.LEFT_PAREN, t, None, line)
+                case _ if (m := re.match(r"\)", buffer)):
+                    t = m.group()
+                    token = ValidToken(ValidTokenType.RIGHT_PAREN, t, None, line)
+                case _ if (m := re.match(r"{", buffer)):
+                    t = m.group()
+                    token = ValidToken(ValidTokenType.LEFT_BRACE, t, None, line)
+                case _ if (m := re.match(r"}", buffer)):
+                    t = m.group()
+                    token = ValidToken(ValidTokenType.RIGHT_BRACE, t, None, line)
+                case _ if (m := re.match(r",", buffer)):
+                    t = m.group()
+                    token = ValidToken(ValidTokenType.COMMA, t, None, line)
+                case _ if (m := re.match(r"\.", buffer)):
+                    t = m.group()
+                    token = ValidToken(ValidTokenType.DOT, t, None, line)
+                case _ if (m := re.match(r"-", buffer)):
+                    t = m.group()
+                    token = ValidToken(ValidTokenType.MINUS, t, None, line)
+                case _ if (m := re.match(r"\+", buffer)):
+                    t = m.group()
+                    token = ValidToken(ValidTokenType.PLUS, t, None, line)
+                case _ if (m := re.match(r";", buffer)):
+                    t = m.group()
+                    token = ValidToken(ValidTokenType.SEMICOLON, t, None, line)
+                case _ if (m := re.match(r"\*", buffer)):
+                    t = m.group()
+                    token = ValidToken(ValidTokenType.STAR, t, None, line)
+                case _ if buffer.startswith("!"):
+                    if len(buffer) >= 2 and buffer[1] == "=":
+                        token = ValidToken(ValidTokenType.BANG_EQUAL, "!=", None, line)
+                    else:
+                        token = ValidToken(ValidTokenType.BANG, "!", None, line)
+                case _ if buffer.startswith("="):
+                    if len(buffer) >= 2 and buffer[1] == "=":
+                        token = ValidToken(ValidTokenType.EQUAL_EQUAL, "==", None, line)
+                    else:
+                        token = ValidToken(ValidTokenType.EQUAL, "=", None, line)
+                case _ if buffer.startswith(">"):
+                    if len(buffer) >= 2 and buffer[1] == "=":
+                        token = ValidToken(
+                            ValidTokenType.GREATER_EQUAL, ">=", None, line
+                        )
+                    else:
+                        token = ValidToken(ValidTokenType.GREATER, ">", None, line)
+                case _ if buffer.startswith("<"):
+                    if len(buffer) >= 2 and buffer[1] == "=":
+                        token = ValidToken(ValidTokenType.LESS_EQUAL, "<=", None, line)
+                    else:
+                        token = ValidToken(ValidTokenType.LESS, "<", None, line)
+                case _ if (m := re.match(r"\"([^\"]*)\"", buffer)):
+                    # match strings
+                    t = m.group()
+                    token = ValidToken(ValidTokenType.STRING, t, m.group(1), line)
+                case _ if (m := re.match(r"\d+(\.?\d*)?", buffer)):
+                    # NB: The below is simply a workaround the accomodate the
+                    # incoinsistent design choice made by the author of the
+                    # lox language in the representation of integers between the parser and the evaluator
+                    # REF: https://forum.codecrafters.io/t/mutually-contradictory-test-cases-for-ht8-vs-lv1/3475
+                    t = m.group()
+                    if m.group(1) == "":
+                        token = ValidToken(
+                            ValidTokenType.INTEGER, t, f"{m.group(0)}.0", line
+                        )
+                    else:
+                        # match number literals
+                        # handle trailing zeros sensibly
+                        literal = re.sub(r"0+$", r"", t)
+                        literal = re.sub(r"\.$", r".0", literal)
+                        token = ValidToken(ValidTokenType.FLOAT, t, literal, line)
+                case _ if (m := re.match(r"[A-z_][\w]*", buffer)):
+                    # match keywords and identifiers
+                    t = m.group()
+                    if t in [
+                        "and",
+                        "class",
+                        "else",
+                        "false",
+                        "fun",
+                        "for",
+                        "if",
+                        "nil",
+                        "or",
+                        "print",
+                        "return",
+                        "super",
+                        "this",
+                        "true",
+                        "var",
+                        "while",
+                    ]:
+                        token = ValidToken(
+                            getattr(ValidTokenType, t.upper()), t, None, line
+                        )
+                    else:
+                        token = ValidToken(ValidTokenType.IDENTIFIER, t, None, line)
+                case _ if (m := re.match(r"[\n]+", buffer)):
+                    # match newline character(s)
+                    t = m.group()
+                    token = _White(t)
+                    line += len(t)
+                case _ if (m := re.match(r"[ \t]+", buffer)):
+                    # match contiguous tabs and spaces
+                    t = m.group()
+                    token = _White(t)
+                case _ if buffer.startswith("/"):
+                    if m := re.match(r"//.+", buffer):
+                        # match comment
+                        t = m.group()
+                        token = _White(t)
+                    else:
+                        token = ValidToken(ValidTokenType.SLASH, "/", None, line)
+                case _ if (m := re.match(r"\"[^\"\n]*", buffer)):
+                    # match unbalanced strings (error)
+                    t = m.group()
+                    lox.Lox.session.error1(line, "Unterminated string.")
+                    token = _White(t)
+                case _:
+                    t = buffer[0]
+                    lox.Lox.session.error1(line, f"Unexpected character: {t}")
+                    token = _White(t)
+
+            if isinstance(token, ValidToken):
+                self.tokens.append(token)
+
+            i += len(token.lexeme)
+
+        self.tokens.append(ValidToken(ValidTokenType.EOF, "", None, line))
+
+        return self.tokens
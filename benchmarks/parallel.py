@@ -0,0 +1,68 @@
+"""Time the sequential and the chunked, multi-process front end.
+
+    python -m benchmarks.parallel [--size 16M] [--jobs 2,4,8]
+
+The script is a long run of top-level declarations and prints, the shape the
+parallel front end is meant for. Only scanning and parsing are timed. Each
+worker re-parses its chunk, and the trees are pickled back to this process,
+so a speedup needs several idle cores.
+"""
+
+import io
+import os
+from argparse import ArgumentParser
+from time import perf_counter
+
+from app.lox import LoxSession
+from app.parallel import parse_parallel
+from benchmarks.scanner import parse_size
+
+LINES = (
+    "var v{0} = {0} * 2 + 1;\n",
+    'print "item {0}; {{done}}";\n',
+    "if (v{0} > 10) print v{0}; else {{ print -v{0}; }}\n",
+)
+
+
+def make_program(size: int) -> str:
+    lines, length, i = [], 0, 0
+    while length < size:
+        line = LINES[i % len(LINES)].format(i - i % len(LINES))
+        lines.append(line)
+        length += len(line)
+        i += 1
+
+    return "".join(lines)
+
+
+def main():
+    parser = ArgumentParser(description="Parallel front end benchmark")
+    parser.add_argument("--size", default="16M")
+    parser.add_argument("--jobs", default=None, help="Comma-separated job counts")
+    args = parser.parse_args()
+
+    jobs = [int(count) for count in args.jobs.split(",")] if args.jobs else []
+    if not jobs:
+        jobs = sorted({2, os.cpu_count() or 1} - {1}) or [2]
+    source = make_program(parse_size(args.size))
+
+    session = LoxSession(stderr=io.StringIO())
+    start = perf_counter()
+    statements = session.parse(session.tokenize(source))
+    sequential = perf_counter() - start
+    megabytes = len(source) >> 20
+    print(f"{os.cpu_count()} cores, {megabytes} MiB, {len(statements)} statements")
+    print(f"{'jobs':>6} {'time (s)':>10} {'speedup':>8}")
+    print(f"{1:>6} {sequential:>10.3f} {1:>7.2f}x")
+
+    for count in jobs:
+        start = perf_counter()
+        chunked = parse_parallel(source, count)
+        seconds = perf_counter() - start
+        if chunked is None or len(chunked) != len(statements):
+            raise SystemExit(f"{count} jobs: the chunked parse disagrees")
+        print(f"{count:>6} {seconds:>10.3f} {sequential / seconds:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Compare the precedence-climbing parser against the recursive-descent one.
+
+    python -m benchmarks.parser [--sizes 100K,1M,10M] [--legacy-limit 10M]
+
+Each size is a generated program of whole statements, mixing the scanner
+benchmark's snippet with expression-heavy lines. It is scanned once and then
+parsed by both engines; throughput is in tokens per second of parsing alone.
+"""
+
+import io
+from argparse import ArgumentParser
+from time import perf_counter
+
+from app.lox import LoxSession
+from app.parser import Parser
+from benchmarks.legacy_parser import LegacyParser
+from benchmarks.scanner import SNIPPET, parse_size
+
+EXPRESSIONS = """var a = (1 + 2) * 3 - -4 / 5;
+print a >= 2 and a <= 10 or !(a == 7) and a != nil;
+a = a * a + a / 2 - (a - 1) * (a + 1);
+if ((a + 1) * 2 > 3 == true) print "big"; else a = a - 1;
+"""
+BLOCK = SNIPPET + EXPRESSIONS
+
+
+def make_program(size: int) -> str:
+    return BLOCK * max(1, size // len(BLOCK))
+
+
+def time_engine(engine, tokens) -> tuple[float, int]:
+    session = LoxSession(stderr=io.StringIO())
+    start = perf_counter()
+    statements = engine(tokens, session).parse()
+    seconds = perf_counter() - start
+
+    if session.had_error:
+        raise SystemExit(f"{engine.__name__} reported errors")
+    return seconds, len(statements)
+
+
+def main():
+    parser = ArgumentParser(description="Parser benchmark")
+    parser.add_argument("--sizes", default="100K,1M,10M")
+    parser.add_argument("--legacy-limit", default="10M")
+    args = parser.parse_args()
+
+    legacy_limit = parse_size(args.legacy_limit)
+
+    header = f"{'size':>10} {'tokens':>10} {'legacy (s)':>12} {'new (s)':>10}"
+    print(f"{header} {'Mtok/s':>8} {'speedup':>8}")
+    for size in map(parse_size, args.sizes.split(",")):
+        tokens = LoxSession().tokenize(make_program(size))
+        new, count = time_engine(Parser, tokens)
+        rate = len(tokens) / new / 1e6
+        if size <= legacy_limit:
+            legacy, legacy_count = time_engine(LegacyParser, tokens)
+            if legacy_count != count:
+                raise SystemExit("the parsers disagree on the statement count")
+            row = f"{legacy:>12.3f} {new:>10.3f} {rate:>8.2f} {legacy / new:>7.1f}x"
+        else:
+            row = f"{'skipped':>12} {new:>10.3f} {rate:>8.2f} {'-':>8}"
+        print(f"{size:>10} {len(tokens):>10} {row}")
+
+
+if __name__ == "__main__":
+    main()
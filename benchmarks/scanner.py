@@ -0,0 +1,66 @@
+"""Compare the single-pass scanner against the original slice-and-regex one.
+
+    python -m benchmarks.scanner [--sizes 1K,1M,50M] [--legacy-limit 1M]
+
+The legacy engine is quadratic in the input size, so it is skipped for inputs
+larger than ``--legacy-limit``.
+"""
+
+from argparse import ArgumentParser
+from time import perf_counter
+
+from app.scanner import Scanner
+from benchmarks.legacy_scanner import LegacyScanner
+
+SNIPPET = """// accumulate a running total
+var total = 0;
+for (var i = 0; i < 100; i = i + 1) {
+  if (i >= 50 and total != 12.50) total = total + i * 2;
+  else print "below the half-way mark";
+}
+print total;
+"""
+
+UNITS = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+
+def parse_size(text: str) -> int:
+    text = text.strip().upper()
+    if text[-1] in UNITS:
+        return int(float(text[:-1]) * UNITS[text[-1]])
+    return int(text)
+
+
+def make_source(size: int) -> str:
+    repeats = size // len(SNIPPET) + 1
+    return (SNIPPET * repeats)[:size]
+
+
+def time_engine(engine, source: str) -> tuple[float, int]:
+    start = perf_counter()
+    tokens = engine(source).scan()
+    return perf_counter() - start, len(tokens)
+
+
+def main():
+    parser = ArgumentParser(description="Scanner benchmark")
+    parser.add_argument("--sizes", default="1K,1M,50M")
+    parser.add_argument("--legacy-limit", default="1M")
+    args = parser.parse_args()
+
+    legacy_limit = parse_size(args.legacy_limit)
+
+    print(f"{'size':>10} {'tokens':>10} {'legacy (s)':>12} {'new (s)':>10} {'speedup':>8}")
+    for size in map(parse_size, args.sizes.split(",")):
+        source = make_source(size)
+        new, count = time_engine(Scanner, source)
+        if size <= legacy_limit:
+            legacy, _ = time_engine(LegacyScanner, source)
+            row = f"{legacy:>12.3f} {new:>10.3f} {legacy / new:>7.1f}x"
+        else:
+            row = f"{'skipped':>12} {new:>10.3f} {'-':>8}"
+        print(f"{size:>10} {count:>10} {row}")
+
+
+if __name__ == "__main__":
+    main()
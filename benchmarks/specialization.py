@@ -0,0 +1,88 @@
+"""Time binary operators with and without type feedback.
+
+    python -m benchmarks.specialization [--iterations 40000] [--repeat 3]
+
+"generic" runs every Binary node through the full operator dispatch and its
+operand checks, as the tree interpreter did before; "specialized" is the
+current behaviour, where nodes that keep seeing numbers (or strings) switch to
+a guarded fast path after a short warm-up.
+"""
+
+import io
+from argparse import ArgumentParser
+from time import perf_counter
+
+from app.lox import LoxSession
+from app.expr import Binary
+from app.interpreter import Interpreter
+
+PROGRAMS = {
+    "arithmetic": """var total = 0;
+var scale = 1.5;
+for (var i = 0; i < {iterations}; i = i + 1) {{
+  total = total + i * scale - i / 4;
+  if (total > 1000000 and i >= 20000) total = total - 1000000;
+}}
+print total;
+""",
+    "while": """var i = 0;
+var sum = 0;
+while (i < {iterations}) {{
+  sum = sum + i * 2 - 1;
+  i = i + 1;
+}}
+print sum;
+""",
+    "strings": """var s = "";
+var parts = 0;
+for (var i = 0; i < {iterations}; i = i + 1) {{
+  if (s != "") parts = parts + 1;
+  s = "a" + "b";
+}}
+print parts;
+""",
+}
+
+
+class GenericInterpreter(Interpreter):
+    def record_types(self, expr: Binary, left: object, right: object) -> None:
+        pass
+
+
+def run(source: str, generic: bool) -> tuple[float, str]:
+    stdout = io.StringIO()
+    session = LoxSession(stdout=stdout)
+    if generic:
+        session.interpreter = GenericInterpreter(session.interpreter.output, session)
+
+    start = perf_counter()
+    session.run(source)
+    return perf_counter() - start, stdout.getvalue()
+
+
+def main():
+    parser = ArgumentParser(description="Binary operator specialization benchmark")
+    parser.add_argument("--iterations", type=int, default=40000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'program':<12} {'generic (s)':>12} {'specialized (s)':>16} {'speedup':>8}")
+    for name, program in PROGRAMS.items():
+        source = program.format(iterations=args.iterations)
+        results = dict()
+        for mode in ("generic", "specialized"):
+            runs = [run(source, mode == "generic") for _ in range(args.repeat)]
+            results[mode] = (min(seconds for seconds, _ in runs), runs[0][1])
+
+        if results["generic"][1] != results["specialized"][1]:
+            raise SystemExit(f"{name}: generic and specialized runs differ")
+
+        generic, specialized = results["generic"][0], results["specialized"][0]
+        print(
+            f"{name:<12} {generic:>12.3f} {specialized:>16.3f} "
+            f"{generic / specialized:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Measure CLI start-up: what each command imports and how long a run takes.
+
+    python -m benchmarks.startup [--commands tokenize,run] [--repeat 20]
+                                 [--max-import-ms 50]
+
+Every command runs once under ``python -X importtime`` against a tiny program,
+then ``--repeat`` times for wall-clock timing next to a bare ``python -c pass``.
+"imports" is the cumulative import time of the modules the CLI loaded itself.
+The exit status is 1 when a command imports a module listed for it in
+FORBIDDEN (an eager import crept back in) or takes longer than
+``--max-import-ms`` to import.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from argparse import ArgumentParser
+from time import perf_counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+PROGRAMS = {
+    "tokenize": "var answer = 6 * 7;\n",
+    "parse": "(1 + 2) * -3\n",
+    "evaluate": '"forty" + "two"\n',
+    "run": "var answer = 6 * 7;\nprint answer;\n",
+}
+
+# NB: nothing here is needed for a plain "<command> <file>" invocation
+_ALWAYS = (
+    "argparse",
+    "multiprocessing",
+    "concurrent.futures",
+    "pickle",
+    "app.batch",
+    "app.cache",
+    "app.repl",
+    "app.closures",
+    "app.vm",
+    "app.profiler",
+    "app.limits",
+    "app.optimizer",
+)
+FORBIDDEN = {
+    "tokenize": _ALWAYS + ("app.parser", "app.interpreter", "app.resolver"),
+    "parse": _ALWAYS + ("app.interpreter", "app.resolver"),
+    "evaluate": _ALWAYS + ("app.ast_printer",),
+    "run": _ALWAYS + ("app.ast_printer",),
+}
+
+
+def import_times(command: str, path: str) -> Tuple[float, List[str]]:
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "app.main", command, path],
+        capture_output=True,
+        text=True,
+    )
+
+    # NB: lines read "import time: self | cumulative | name", nested imports
+    # indented; everything up to runpy is the interpreter starting itself
+    total, modules, started = 0, [], False
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not started:
+            started = name.strip() == "runpy"
+            continue
+
+        modules.append(name.strip())
+        if not name[1:].startswith(" "):
+            total += int(cumulative)
+
+    return total / 1e3, modules
+
+
+def wall_time(arguments: Sequence[str], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        subprocess.run([sys.executable, *arguments], capture_output=True)
+        times.append(perf_counter() - start)
+
+    return statistics.median(times) * 1e3
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = ArgumentParser(description="Lox start-up benchmark")
+    parser.add_argument("--commands", default=None, help="Comma-separated subset")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--max-import-ms", type=float, default=50.0)
+    args = parser.parse_args(argv)
+
+    commands = args.commands.split(",") if args.commands else list(PROGRAMS)
+    bare = wall_time(["-c", "pass"], args.repeat)
+    print(f"python -c pass: {bare:.1f} ms\n")
+
+    failures = []
+    results: Dict[str, Tuple[float, float, int]] = dict()
+    with tempfile.TemporaryDirectory() as directory:
+        for command in commands:
+            path = os.path.join(directory, f"{command}.lox")
+            with open(path, "w") as file:
+                file.write(PROGRAMS[command])
+
+            imports, modules = import_times(command, path)
+            wall = wall_time(["-m", "app.main", command, path], args.repeat)
+            results[command] = (imports, wall, len(modules))
+
+            for module in FORBIDDEN[command]:
+                if module in modules:
+                    failures.append(f"{command} imports {module}")
+            if imports > args.max_import_ms:
+                failures.append(f"{command} imports for {imports:.1f} ms")
+
+    print(f"{'command':<10} {'modules':>8} {'imports (ms)':>13} {'wall (ms)':>10}")
+    for command, (imports, wall, count) in results.items():
+        print(f"{command:<10} {count:>8} {imports:>13.1f} {wall:>10.1f}")
+
+    if failures:
+        print("\n" + "\n".join(failures))
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,174 @@
+"""Time the scan, parse and execute phases of representative Lox workloads.
+
+    python -m benchmarks.suite [--workloads arithmetic,strings] [--engine tree]
+                               [--warmup 1] [--repeat 5] [--output results.json]
+                               [--baseline baseline.json] [--threshold 0.10]
+
+Each workload runs ``--warmup`` untimed rounds and then ``--repeat`` timed
+ones in a fresh session. "execute" covers resolution and interpretation. The
+median of every phase is compared against ``--baseline`` (a previous
+``--output`` file), and the exit status is 1 when any phase got slower than
+``--threshold``; phases faster than ``--min-seconds`` are too noisy to judge.
+benchmarks/baseline.json holds the reference run for the tree engine.
+"""
+
+import io
+import json
+import os
+import platform
+import statistics
+from argparse import ArgumentParser
+from time import perf_counter
+from typing import Dict, List, Optional, Sequence
+
+from app.lox import ENGINES, LoxSession
+from benchmarks.scanner import SNIPPET, make_source, parse_size
+
+WORKLOADS_DIR = os.path.join(os.path.dirname(__file__), "workloads")
+PHASES = ("scan", "parse", "execute")
+
+
+class Workload:
+    def __init__(self, name: str, source: str, phases: Sequence[str] = PHASES):
+        self.name = name
+        self.source = source
+        self.phases = phases
+
+
+def load_workloads(scan_size: int) -> Dict[str, Workload]:
+    workloads = dict()
+    for filename in sorted(os.listdir(WORKLOADS_DIR)):
+        name, extension = os.path.splitext(filename)
+        if extension == ".lox":
+            with open(os.path.join(WORKLOADS_DIR, filename)) as file:
+                workloads[name] = Workload(name, file.read())
+
+    # NB: the front-end workloads are generated so their size can be tuned;
+    # the parse one repeats the snippet whole so it stays a valid program
+    workloads["tokenize"] = Workload("tokenize", make_source(scan_size), ("scan",))
+    snippets = max(1, scan_size // 4 // len(SNIPPET))
+    workloads["parse"] = Workload("parse", SNIPPET * snippets, ("scan", "parse"))
+
+    return workloads
+
+
+def time_once(workload: Workload, engine: str) -> Dict[str, float]:
+    session = LoxSession(engine, stdout=io.StringIO(), stderr=io.StringIO())
+    timings = dict()
+
+    start = perf_counter()
+    tokens = session.tokenize(workload.source)
+    timings["scan"] = perf_counter() - start
+    if "parse" not in workload.phases:
+        return timings
+
+    start = perf_counter()
+    statements = session.parse(tokens)
+    timings["parse"] = perf_counter() - start
+    if "execute" not in workload.phases:
+        return timings
+
+    start = perf_counter()
+    session.resolve(statements)
+    session.interpreter.interpret(statements)
+    timings["execute"] = perf_counter() - start
+
+    return timings
+
+
+def measure(workload: Workload, engine: str, warmup: int, repeat: int) -> dict:
+    for _ in range(warmup):
+        time_once(workload, engine)
+
+    runs: Dict[str, List[float]] = {phase: [] for phase in workload.phases}
+    for _ in range(repeat):
+        for phase, seconds in time_once(workload, engine).items():
+            runs[phase].append(seconds)
+
+    return {
+        phase: {
+            "median": statistics.median(times),
+            "min": min(times),
+            "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+            "runs": times,
+        }
+        for phase, times in runs.items()
+    }
+
+
+def compare(
+    results: dict, baseline: dict, threshold: float, min_seconds: float
+) -> List[str]:
+    regressions = []
+    header = f"{'workload':<12} {'phase':<8} {'baseline':>10} {'current':>10}"
+    print(f"{header} {'change':>8}")
+    for name, phases in results.items():
+        for phase, stats in phases.items():
+            previous = baseline.get(name, {}).get(phase)
+            if previous is None:
+                continue
+
+            change = stats["median"] / previous["median"] - 1
+            flag = ""
+            if change > threshold and previous["median"] >= min_seconds:
+                regressions.append(f"{name}/{phase}")
+                flag = "  REGRESSION"
+            print(
+                f"{name:<12} {phase:<8} {previous['median']:>10.4f} "
+                f"{stats['median']:>10.4f} {change:>+8.1%}{flag}"
+            )
+
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = ArgumentParser(description="Lox benchmark suite")
+    parser.add_argument("--workloads", default=None, help="Comma-separated subset")
+    parser.add_argument("--engine", choices=list(ENGINES), default="tree")
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scan-size", default="4M")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--threshold", type=float, default=0.10)
+    parser.add_argument("--min-seconds", type=float, default=0.005)
+    args = parser.parse_args(argv)
+
+    workloads = load_workloads(parse_size(args.scan_size))
+    names = args.workloads.split(",") if args.workloads else list(workloads)
+
+    results = dict()
+    print(f"{'workload':<12} {'phase':<8} {'median (s)':>10} {'min (s)':>10}")
+    for name in names:
+        results[name] = measure(workloads[name], args.engine, args.warmup, args.repeat)
+        for phase, stats in results[name].items():
+            median, fastest = stats["median"], stats["min"]
+            print(f"{name:<12} {phase:<8} {median:>10.4f} {fastest:>10.4f}")
+
+    report = {
+        "python": platform.python_version(),
+        "engine": args.engine,
+        "warmup": args.warmup,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if args.baseline is None:
+        return 0
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)["results"]
+    print()
+    regressions = compare(results, baseline, args.threshold, args.min_seconds)
+    if regressions:
+        print(f"\nregressed beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,56 @@
+"""Measure the memory held by a scanned token list, in bytes per token.
+
+    python -m benchmarks.tokens [--size 4M]
+
+"object" is the previous layout (one ValidToken with a __dict__ per token),
+"slots" is a list of the current __slots__ ValidToken and "buffer" is the
+struct-of-arrays TokenBuffer returned by Scanner.scan.
+"""
+
+import io
+import tracemalloc
+from argparse import ArgumentParser
+
+from app.scanner import Scanner, StreamScanner
+from benchmarks.scanner import make_source, parse_size
+
+
+class DictToken:
+    def __init__(self, type_, lexeme, literal, line):
+        self.type = type_
+        self.lexeme = lexeme
+        self.literal = literal
+        self.line = line
+
+
+def measure(build) -> tuple[int, int]:
+    tracemalloc.start()
+    tokens = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, len(tokens)
+
+
+def main():
+    parser = ArgumentParser(description="Token memory benchmark")
+    parser.add_argument("--size", default="4M")
+    args = parser.parse_args()
+
+    source = make_source(parse_size(args.size))
+    layouts = {
+        "object": lambda: [
+            DictToken(t.type, t.lexeme, t.literal, t.line)
+            for t in StreamScanner(io.StringIO(source))
+        ],
+        "slots": lambda: list(StreamScanner(io.StringIO(source))),
+        "buffer": lambda: Scanner(source).scan(),
+    }
+
+    print(f"{'layout':>8} {'tokens':>10} {'bytes':>12} {'bytes/token':>12}")
+    for name, build in layouts.items():
+        size, count = measure(build)
+        print(f"{name:>8} {count:>10} {size:>12} {size / count:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
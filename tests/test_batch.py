@@ -0,0 +1,34 @@
+from app.batch import collect_scripts, run_batch
+
+
+def test_lox_file_is_a_single_script(tmp_path):
+    script = tmp_path / "script.lox"
+    script.write_text('print "not a path";\n')
+    assert collect_scripts(str(script)) == [str(script)]
+
+
+def test_other_files_are_manifests(tmp_path):
+    (tmp_path / "a.lox").write_text("print 1;\n")
+    manifest = tmp_path / "scripts.txt"
+    manifest.write_text("# comment\na.lox\n\n")
+    assert collect_scripts(str(manifest)) == [str(tmp_path / "a.lox")]
+
+
+def test_batch_runs_a_single_script(tmp_path):
+    script = tmp_path / "script.lox"
+    script.write_text("print 1 + 2;\n")
+    [result] = run_batch(collect_scripts(str(script)), jobs=1)
+    assert result["exit_code"] == 0
+    assert result["stdout"] == "3\n"
+
+
+def test_batch_cache_respects_max_bytes(tmp_path):
+    script = tmp_path / "script.lox"
+    script.write_text("print 1 + 2;\n")
+    for max_bytes, entries in ((1, 0), (1 << 20, 1)):
+        cache_dir = tmp_path / f"cache-{max_bytes}"
+        [result] = run_batch(
+            [str(script)], jobs=1, cache_dir=str(cache_dir), cache_max_bytes=max_bytes
+        )
+        assert result["exit_code"] == 0
+        assert len(list(cache_dir.glob("*.ast"))) == entries
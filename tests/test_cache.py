@@ -0,0 +1,44 @@
+import os
+
+from app import cache as cache_module
+from app.cache import RESCAN_INTERVAL, AstCache
+from app.lox import LoxSession
+
+
+def parse(source: str):
+    session = LoxSession()
+    return session.parse(session.tokenize(source))
+
+
+def entry_bytes(directory) -> int:
+    return sum(path.stat().st_size for path in directory.glob("*.ast"))
+
+
+def test_stores_do_not_rescan_the_directory(tmp_path, monkeypatch):
+    scans = []
+    scandir = os.scandir
+
+    def counting_scandir(path):
+        scans.append(path)
+        return scandir(path)
+
+    monkeypatch.setattr(cache_module.os, "scandir", counting_scandir)
+    cache = AstCache(str(tmp_path))
+    stores = 4 * RESCAN_INTERVAL
+    for i in range(stores):
+        cache.store(f"print {i};", parse(f"print {i};"))
+
+    assert cache.stores == stores
+    assert len(scans) == 1 + (stores - 1) // RESCAN_INTERVAL
+
+
+def test_eviction_keeps_the_cache_within_max_bytes(tmp_path):
+    cache = AstCache(str(tmp_path), max_bytes=4096)
+    for i in range(2 * RESCAN_INTERVAL):
+        source = f"print {i};"
+        cache.store(source, parse(source))
+        assert entry_bytes(tmp_path) <= cache.max_bytes
+
+    assert cache.evictions > 0
+    assert cache.load("print 0;") is None
+    assert cache.load(f"print {2 * RESCAN_INTERVAL - 1};") is not None
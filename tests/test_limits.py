@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(tmp_path, source: str, *options: str) -> subprocess.CompletedProcess:
+    path = tmp_path / "script.lox"
+    path.write_text(source)
+    return subprocess.run(
+        [sys.executable, "-m", "app.main", "run", *options, str(path)],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+    )
+
+
+@pytest.mark.parametrize("opt_level", ["0", "1"])
+def test_statement_limit_in_empty_loop_body(tmp_path, opt_level):
+    source = "print 1;\n\n\nwhile (true) {}\n"
+    result = run(tmp_path, source, "--max-statements=100", "-O", opt_level)
+    assert result.returncode == 70
+    assert result.stdout == "1\n"
+    assert result.stderr == "Exceeded the limit of 100 executed statements.\n[line 4]\n"
+
+
+@pytest.mark.parametrize("opt_level", ["0", "1"])
+def test_iteration_limit_in_for_without_condition(tmp_path, opt_level):
+    source = "var a = 0;\n\n\nfor (;;) {\n  a = a + 1;\n}\n"
+    result = run(tmp_path, source, "--max-iterations=100", "-O", opt_level)
+    assert result.returncode == 70
+    assert result.stderr == "Exceeded the limit of 100 loop iterations.\n[line 4]\n"
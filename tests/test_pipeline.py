@@ -0,0 +1,78 @@
+import io
+
+import pytest
+
+from app import main
+from app.cache import AstCache
+from app.lox import Lox, LoxSession
+from app.scanner import Scanner
+
+PROGRAM = "var a = 1;\nprint a + 2;\n"
+
+
+@pytest.fixture
+def scans(monkeypatch):
+    calls = []
+    scan = Scanner.scan
+
+    def counting_scan(self):
+        calls.append(self)
+        return scan(self)
+
+    monkeypatch.setattr(Scanner, "scan", counting_scan)
+    return calls
+
+
+@pytest.fixture
+def session(monkeypatch):
+    session = LoxSession(stdout=io.StringIO(), stderr=io.StringIO())
+    monkeypatch.setattr(Lox, "session", session)
+    return session
+
+
+@pytest.fixture
+def script(tmp_path):
+    def write(source: str) -> str:
+        path = tmp_path / "script.lox"
+        path.write_text(source)
+        return str(path)
+
+    return write
+
+
+def test_run_scans_once(scans):
+    stdout = io.StringIO()
+    assert LoxSession(stdout=stdout).run(PROGRAM).ok
+    assert stdout.getvalue() == "3\n"
+    assert len(scans) == 1
+
+
+def test_evaluate_scans_once(scans, session):
+    assert session.evaluate("1 + 2").ok
+    assert len(scans) == 1
+
+
+def test_scan_error_reported_once(scans, session):
+    result = session.run('print "unterminated;\n')
+    messages = [error.message for error in result.errors]
+    assert messages.count("Unterminated string.") == 1
+    assert len(scans) == 1
+
+
+@pytest.mark.parametrize("command", ["parse", "evaluate", "run"])
+def test_commands_scan_once(command, scans, session, script, capsys):
+    source = "1 + 2\n" if command != "run" else PROGRAM
+    main.run_command(command, script(source))
+    assert len(scans) == 1
+
+
+def test_cache_hit_skips_scanner(scans, script, tmp_path):
+    cache = AstCache(str(tmp_path / "cache"))
+    LoxSession(stdout=io.StringIO(), cache=cache).run(PROGRAM)
+    assert len(scans) == 1
+
+    stdout = io.StringIO()
+    assert LoxSession(stdout=stdout, cache=cache).run(PROGRAM).ok
+    assert stdout.getvalue() == "3\n"
+    assert cache.hits == 1
+    assert len(scans) == 1
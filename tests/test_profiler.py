@@ -0,0 +1,25 @@
+import io
+
+from app.lox import LoxSession
+
+# NB: Lox has no break, so the endless loop ends on a runtime error
+PROGRAM = """var a = 0;
+for (; a < 3;) a = a + 1;
+
+
+
+for (;;) {
+  a = a + 1;
+  if (a > 6) a = a + nil;
+}
+"""
+
+
+def test_loops_are_keyed_by_their_own_line():
+    session = LoxSession(stdout=io.StringIO(), stderr=io.StringIO(), profile=True)
+    result = session.run(PROGRAM)
+    assert result.exit_code == 70
+
+    profile = session.interpreter.profile
+    assert profile.loops == {2: 3, 6: 4}
+    assert profile.to_json()["loops"] == {"2": 3, "6": 4}